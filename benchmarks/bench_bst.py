@@ -0,0 +1,79 @@
+"""Benchmark BST, AVL, ArrayAVL, RedBlack and BlockList build, insert, search, in_order, delete and churn
+on sorted, reversed, shuffled and duplicate-heavy input.
+
+'build' is the constructor (bulk_load for AVL, RedBlack and BlockList), 'insert' inserts the keys one at a time into an empty tree.
+
+Usage:
+    python -m benchmarks.bench_bst [--max-exp 5] [--repeat 1] [--tree avl]
+
+A plain BST degenerates into a linked list on sorted or reversed input, so its sizes are capped
+with --bst-max-exp (every insert is O(n) there).
+"""
+import argparse
+
+from benchmarks.common import make_input, sizes, time_call
+from src.data_structures.array_avl import ArrayAVL
+from src.data_structures.avl import AVL
+from src.data_structures.block_list import BlockList
+from src.data_structures.bst import BST
+from src.data_structures.red_black import RedBlack
+
+TREES = {'bst': BST, 'avl': AVL, 'array_avl': ArrayAVL, 'red_black': RedBlack, 'blocks': BlockList}
+
+
+def insert_all(tree, integers):
+    insert = tree.insert
+    for i in integers:
+        insert(i)
+
+
+def search_all(tree, integers):
+    search = tree.search
+    for i in integers:
+        search(i)
+
+
+def delete_all(tree, integers):
+    delete = tree.delete
+    for i in integers:
+        delete(i)
+
+
+def churn(tree, integers):
+    """Delete-heavy workload: delete every key and insert it straight back (tree size stays the same)."""
+    delete, insert = tree.delete, tree.insert
+    for i in integers:
+        delete(i)
+        insert(i)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max-exp', type=int, default=5, help="Largest size is 10^max-exp.")
+    parser.add_argument('--bst-max-exp', type=int, default=4, help="Largest size for a plain BST.")
+    parser.add_argument('--repeat', type=int, default=1, help="Runs per size (best is reported).")
+    parser.add_argument('--tree', choices=sorted(TREES), action='append', help="Tree(s) to benchmark.")
+    args = parser.parse_args()
+
+    print("{:>9} {:>10} {:>10} {:>12} {:>12} {:>12} {:>12} {:>12} {:>12}".format(
+        "tree", "input", "n", "build (s)", "insert (s)", "search (s)", "in_order (s)", "delete (s)", "churn (s)"))
+    for name in args.tree or sorted(TREES):
+        cls = TREES[name]
+        max_exp = min(args.bst_max_exp, args.max_exp) if cls is BST else args.max_exp
+        for kind in ('sorted', 'reversed', 'shuffled', 'duplicates'):
+            for n in sizes(max_exp):
+                integers = make_input(kind, n)
+                tree = cls(integers)
+                row = [
+                    time_call(lambda: None, lambda _: cls(integers), args.repeat),
+                    time_call(lambda: cls([]), lambda t: insert_all(t, integers), args.repeat),
+                    time_call(lambda: tree, lambda t: search_all(t, integers), args.repeat),
+                    time_call(lambda: tree, lambda t: t.in_order(), args.repeat),
+                    time_call(lambda: cls(integers), lambda t: delete_all(t, integers), args.repeat),
+                    time_call(lambda: cls(integers), lambda t: churn(t, integers), args.repeat),
+                ]
+                print("{:>9} {:>10} {:>10} {:>12.4f} {:>12.4f} {:>12.4f} {:>12.4f} {:>12.4f} {:>12.4f}".format(name, kind, n, *row))
+
+
+if __name__ == '__main__':
+    main()
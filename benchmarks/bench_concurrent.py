@@ -0,0 +1,117 @@
+"""Benchmark read throughput across threads: ConcurrentAVL (lock free reads) vs AVL behind one global lock.
+
+Every reader thread runs --reads lookups (one range scan of --scan keys every 100 lookups), while one
+writer thread deletes and reinserts random keys, one write for every --ratio reads (50:1 by default).
+Reported: total reads per second, and the speedup over one reader.
+
+Usage:
+    python -m benchmarks.bench_concurrent [--n 100000] [--threads 1 --threads 2 ...] [--reads 20000]
+
+With the GIL, threads take turns, so neither engine can go faster than one thread (the lock only adds
+contention). On a free threaded build (python3.13t, PYTHON_GIL=0) ConcurrentAVL reads run in parallel
+and scale with the cores, while the locked AVL still runs one read at a time.
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+
+from src.data_structures.avl import AVL
+from src.data_structures.concurrent_avl import ConcurrentAVL
+
+
+class LockedAVL:
+    """AVL with every call behind one lock (what callers have to do without ConcurrentAVL)."""
+
+    def __init__(self, integers):
+        self.tree = AVL(integers)
+        self.lock = threading.Lock()
+
+    def search(self, value):
+        with self.lock:
+            return self.tree.search(value)
+
+    def range(self, lo, hi):
+        with self.lock:
+            return list(self.tree.range(lo, hi))
+
+    def insert(self, value):
+        with self.lock:
+            self.tree.insert(value)
+
+    def delete(self, value):
+        with self.lock:
+            return self.tree.delete(value)
+
+
+ENGINES = {'concurrent': ConcurrentAVL, 'locked': LockedAVL}
+
+
+def reader(tree, n, reads, scan, seed):
+    rng = random.Random(seed)
+    search, range_ = tree.search, tree.range
+    for i in range(reads):
+        key = rng.randrange(n)
+        if i % 100:
+            search(key)
+        else:
+            list(range_(key, key + scan))
+
+
+def writer(tree, n, writes, stop):
+    rng = random.Random(-1)
+    for _ in range(writes):
+        if stop.is_set():
+            return
+        key = rng.randrange(n)
+        tree.delete(key)
+        tree.insert(key)
+        time.sleep(0)  # Spread the writes out over the run instead of front loading them.
+
+
+def reads_per_second(tree, n, threads, reads, scan, ratio):
+    """Return the total reads per second of threads readers running alongside one writer."""
+    stop = threading.Event()
+    writes = threads * reads // ratio // 2  # delete + insert.
+    write_thread = threading.Thread(target=writer, args=(tree, n, writes, stop))
+    readers = [threading.Thread(target=reader, args=(tree, n, reads, scan, seed)) for seed in range(threads)]
+
+    start = time.perf_counter()
+    write_thread.start()
+    for thread in readers:
+        thread.start()
+    for thread in readers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    write_thread.join()
+    return threads * reads / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, default=100000, help="Keys in the tree.")
+    parser.add_argument('--threads', type=int, action='append', help="Reader thread count(s). Defaults to 1 2 4 8.")
+    parser.add_argument('--reads', type=int, default=20000, help="Reads per reader thread.")
+    parser.add_argument('--scan', type=int, default=64, help="Width of a range scan.")
+    parser.add_argument('--ratio', type=int, default=50, help="Reads per write.")
+    parser.add_argument('--engine', choices=sorted(ENGINES), action='append', help="Engine(s) to benchmark.")
+    args = parser.parse_args()
+
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print("Python {} ({})".format(sys.version.split()[0], "GIL enabled" if gil else "free threaded, GIL disabled"))
+    print("{:>11} {:>8} {:>14} {:>9}".format("engine", "threads", "reads/s", "speedup"))
+    integers = list(range(args.n))
+    random.Random(0).shuffle(integers)
+    for name in args.engine or sorted(ENGINES):
+        tree = ENGINES[name](integers)
+        single = None
+        for threads in args.threads or [1, 2, 4, 8]:
+            rate = reads_per_second(tree, args.n, threads, args.reads, args.scan, args.ratio)
+            single = single or rate
+            print("{:>11} {:>8} {:>14,.0f} {:>8.2f}x".format(name, threads, rate, rate / single))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Benchmark MaxHeap insert and sorted_array (the core of `maxheap --sort`).
+
+Usage:
+    python -m benchmarks.bench_maxheap [--max-exp 7] [--repeat 1] [--numpy] [--arity 2]
+
+Prints the time per size and time / (n lg(n)). The per-key columns should stay roughly flat if
+inserting n keys and sorting are O(n lg(n)). Run with different --arity values to compare d-ary heaps.
+"""
+import argparse
+from math import log2
+
+from benchmarks.common import make_input, sizes, time_call
+from src.data_structures.maxheap import MaxHeap
+
+
+def insert_all(heap, integers):
+    insert = heap.insert
+    for i in integers:
+        insert(i)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max-exp', type=int, default=7, help="Largest size is 10^max-exp.")
+    parser.add_argument('--repeat', type=int, default=1, help="Runs per size (best is reported).")
+    parser.add_argument('--numpy', action='store_true', help="Feed NumPy arrays (vectorized build and sort).")
+    parser.add_argument('--arity', type=int, default=2, help="Max number of children per node.")
+    args = parser.parse_args()
+
+    if args.numpy:
+        import numpy
+        copy = numpy.array
+    else:
+        copy = list
+
+    print("{:>10} {:>12} {:>16} {:>12} {:>16}".format(
+        "n", "sort (s)", "ns / (n lg n)", "insert (s)", "ns / (n lg n)"))
+    for n in sizes(args.max_exp):
+        integers = make_input('random', n)
+        n_lg_n = n * log2(n)
+        sort_seconds = time_call(lambda: copy(integers),
+                                 lambda arr: MaxHeap(arr, arity=args.arity).sorted_array(), args.repeat)
+        insert_seconds = time_call(lambda: MaxHeap([], arity=args.arity),
+                                   lambda heap: insert_all(heap, integers), args.repeat)
+        print("{:>10} {:>12.4f} {:>16.2f} {:>12.4f} {:>16.2f}".format(
+            n, sort_seconds, sort_seconds * 1e9 / n_lg_n, insert_seconds, insert_seconds * 1e9 / n_lg_n))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Helpers shared by the benchmark scripts."""
+import random
+import time
+
+
+INPUT_KINDS = ('random', 'shuffled', 'sorted', 'reversed', 'duplicates')
+
+
+def make_input(kind, n, seed=0):
+    """Return a list of n non-negative integers.
+
+    :param kind: One of INPUT_KINDS.
+    :param n:    Number of integers.
+    :param seed: Seed for the random number generator (benchmarks should be repeatable).
+    :return:     The list of integers.
+    """
+    rng = random.Random(seed)
+    if kind == 'random':
+        return [rng.randrange(n * 10) for _ in range(n)]
+    elif kind == 'shuffled':  # Distinct.
+        integers = list(range(n))
+        rng.shuffle(integers)
+        return integers
+    elif kind == 'sorted':
+        return list(range(n))
+    elif kind == 'reversed':
+        return list(range(n - 1, -1, -1))
+    elif kind == 'duplicates':
+        return [rng.randrange(16) for _ in range(n)]
+    else:
+        raise ValueError("Unknown input kind: {}".format(kind))
+
+
+def time_call(setup, func, repeat=3):
+    """Return the best wall clock time (in seconds) of func over repeat runs.
+
+    :param setup:  Called before every run (not timed). Its return value is passed to func.
+    :param func:   The function to time.
+    :param repeat: Number of runs.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        arg = setup()
+        start = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def sizes(max_exp, min_exp=3):
+    """Return [10^min_exp, ..., 10^max_exp]."""
+    return [10 ** e for e in range(min_exp, max_exp + 1)]
@@ -0,0 +1,180 @@
+"""Run every benchmark, write the results as JSON, and optionally fail on a regression against a baseline.
+
+Suites:
+    maxheap -- MaxHeap build, insert, extract_max and sorted_array.
+    trees   -- BST and AVL (see --tree) insert, search, delete and in_order.
+    cli     -- The maxheap (default, --sort) and avl console scripts, end to end (parse, build, print),
+               run in a fresh interpreter on a file of integers.
+
+Usage:
+    python -m benchmarks.run [--max-exp 5] [--output results.json] [--baseline baseline.json]
+
+Every result is keyed by (suite, op, kind, n). With --baseline, a result slower than
+baseline * (1 + tolerance) + noise is a regression, and the exit status is 1.
+Baseline and run must come from the same machine for the comparison to mean anything.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_bst import TREES, delete_all, insert_all, search_all
+from benchmarks.common import make_input, sizes, time_call
+from src.data_structures.bst import BST
+from src.data_structures.maxheap import MaxHeap
+
+SUITES = ('maxheap', 'trees', 'cli')
+KINDS = ('random', 'sorted', 'reversed', 'duplicates')
+CLI_COMMANDS = {
+    'maxheap': ['maxheap'],
+    'maxheap --sort': ['maxheap', '--sort'],
+    'avl': ['avl'],
+}
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def extract_all(heap):
+    extract_max = heap.extract_max
+    for _ in range(heap.size()):
+        extract_max()
+
+
+def bench_maxheap(integers, repeat):
+    """Return {op: seconds} for MaxHeap."""
+    def build():
+        return MaxHeap(list(integers))
+
+    return {
+        'build': time_call(lambda: list(integers), MaxHeap, repeat),
+        'insert': time_call(lambda: MaxHeap([]), lambda heap: insert_all(heap, integers), repeat),
+        'extract_max': time_call(build, extract_all, repeat),
+        'sorted_array': time_call(build, lambda heap: heap.sorted_array(), repeat),
+    }
+
+
+def bench_tree(cls, integers, repeat):
+    """Return {op: seconds} for a tree class (one of benchmarks.bench_bst.TREES)."""
+    tree = cls(integers)
+    return {
+        'insert': time_call(lambda: cls([]), lambda t: insert_all(t, integers), repeat),
+        'search': time_call(lambda: tree, lambda t: search_all(t, integers), repeat),
+        'delete': time_call(lambda: cls(integers), lambda t: delete_all(t, integers), repeat),
+        'in_order': time_call(lambda: tree, lambda t: t.in_order(), repeat),
+    }
+
+
+def bench_cli(integers, repeat):
+    """Return {command: seconds} for the console scripts, including interpreter startup."""
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as file:
+        file.write("\n".join(map(str, integers)))
+    try:
+        results = {}
+        for name, (command, *options) in CLI_COMMANDS.items():
+            # Same as the installed console script, without needing it on PATH.
+            args = [sys.executable, '-c', 'from src.cli.commands import {0}; {0}()'.format(command),
+                    file.name] + options
+
+            def run(_):
+                subprocess.run(args, cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+
+            results[name] = time_call(lambda: None, run, repeat)
+        return results
+    finally:
+        os.remove(file.name)
+
+
+def run_benchmarks(args):
+    """Run the selected suites and return the list of results."""
+    results = []
+
+    def record(suite, kind, n, timings):
+        for op, seconds in timings.items():
+            results.append({'suite': suite, 'op': op, 'kind': kind, 'n': n, 'seconds': seconds})
+            print("{:>8} {:>16} {:>10} {:>10} {:>12.4f}".format(suite, op, kind, n, seconds), file=sys.stderr)
+
+    for kind in args.kind or KINDS:
+        for n in sizes(args.max_exp, args.min_exp):
+            integers = make_input(kind, n)
+            if 'maxheap' in args.suites:
+                record('maxheap', kind, n, bench_maxheap(integers, args.repeat))
+            if 'trees' in args.suites:
+                for name in args.tree:
+                    cls = TREES[name]
+                    if cls is BST and n > 10 ** args.bst_max_exp:
+                        continue  # Degenerates into a linked list on sorted input.
+                    record(name, kind, n, bench_tree(cls, integers, args.repeat))
+            if 'cli' in args.suites:
+                record('cli', kind, n, bench_cli(integers, args.repeat))
+    return results
+
+
+def compare(baseline, results, tolerance, noise):
+    """Return the regressions of results against baseline, as printable lines.
+
+    :param tolerance: Allowed slowdown (0.25 is 25%).
+    :param noise:     Allowed slowdown in seconds, on top of tolerance (so tiny timings do not flap).
+    """
+    expected = {(r['suite'], r['op'], r['kind'], r['n']): r['seconds'] for r in baseline['results']}
+    regressions = []
+    for result in results:
+        key = (result['suite'], result['op'], result['kind'], result['n'])
+        if key not in expected:
+            continue
+        before, after = expected[key], result['seconds']
+        if after > before * (1 + tolerance) + noise:
+            regressions.append("{} {} {} n={}: {:.4f}s -> {:.4f}s ({:+.0%})".format(
+                *key, before, after, after / before - 1 if before else float('inf')))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--min-exp', type=int, default=3, help="Smallest size is 10^min-exp.")
+    parser.add_argument('--max-exp', type=int, default=5, help="Largest size is 10^max-exp (up to 7).")
+    parser.add_argument('--bst-max-exp', type=int, default=3, help="Largest size for a plain BST (O(n^2) on sorted input).")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per measurement (best is reported).")
+    parser.add_argument('--suite', dest='suites', choices=SUITES, action='append', help="Suite(s) to run.")
+    parser.add_argument('--kind', choices=KINDS, action='append', help="Input kind(s).")
+    parser.add_argument('--tree', choices=sorted(TREES), action='append', help="Tree(s) for the trees suite.")
+    parser.add_argument('--output', '-o', help="Write the results here (JSON). Defaults to stdout.")
+    parser.add_argument('--baseline', '-b', help="Results (JSON) to compare against.")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed slowdown vs the baseline.")
+    parser.add_argument('--noise', type=float, default=0.005, help="Allowed slowdown in seconds.")
+    args = parser.parse_args()
+    args.suites = args.suites or SUITES
+    args.tree = args.tree or ['bst', 'avl']
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeat': args.repeat,
+        },
+        'results': run_benchmarks(args),
+    }
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=1)
+    else:
+        json.dump(report, sys.stdout, indent=1)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(baseline, report['results'], args.tolerance, args.noise)
+        for line in regressions:
+            print("REGRESSION " + line, file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("No regressions against {}.".format(args.baseline), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -12,6 +12,9 @@ setup(
     install_requires=[
         'Click',
     ],
+    extras_require={
+        'numpy': ['numpy'],
+    },
     tests_require=['pytest'],
     entry_points='''
         [console_scripts]
@@ -1,66 +1,224 @@
+from array import array
+from itertools import chain, islice
+
 import click
-from src.data_structures.maxheap import MaxHeap
+from src.data_structures.maxheap import MaxHeap, top_k
 from src.data_structures.avl import AVL
+from src.data_structures.block_list import BlockList
+from src.data_structures.red_black import RedBlack
+from src.util.ingest import INPUT_FORMATS, read_chunks, read_integers
+from src.util.stats import Stats
+
+ENGINES = {'avl': AVL, 'red-black': RedBlack, 'blocks': BlockList}
 
 
 @click.command()
 @click.option('--sort', '-s', is_flag=True, help="Return sorted list (descending).")
 @click.option('--pretty-print', '-p', is_flag=True, help="Pretty print max heap.")
-@click.argument('file', type=click.File(), default='-', required=False)
-def maxheap(file, pretty_print, sort):
+@click.option('--depth', '-d', type=click.IntRange(min=0), metavar='N',
+              help="Pretty print only the first N levels below the root (default 7, all with --outline).")
+@click.option('--outline', '-o', is_flag=True, help="Pretty print as an indented outline (one line per key, any height).")
+@click.option('--top', '-t', type=click.IntRange(min=1), help="Return the K largest integers (descending).",
+              metavar='K')
+@click.option('--compact', '-c', is_flag=True, help="Store keys in a packed 64 bit array (less memory).")
+@click.option('--arity', '-a', type=click.IntRange(min=2), default=2, show_default=True,
+              help="Max number of children per node.")
+@click.option('--save', type=click.Path(dir_okay=False, writable=True), metavar='PATH',
+              help="Save the max heap to a binary snapshot.")
+@click.option('--load', type=click.Path(exists=True, dir_okay=False), metavar='PATH',
+              help="Load a snapshot (from --save) instead of reading FILE.")
+@click.option('--input-format', '-f', type=click.Choice(INPUT_FORMATS), default='text', show_default=True,
+              help="text: integers separated by whitespace. binary: raw little endian 64 bit integers.")
+@click.option('--stats', 'show_stats', is_flag=True,
+              help="Print operation counts, sift depths/rotations and timings to stderr (slower).")
+@click.argument('file', type=click.File('rb'), default='-', required=False)
+def maxheap(file, pretty_print, depth, outline, sort, top, compact, arity, save, load, input_format, show_stats):
     """Max Heap manipulation.
 
     \b
     The default behavior returns a max heap. Each element is separated by a newline.
 
     \b
-    Arguments:
-      FILE -- Non-negative integers separated by newlines.
-    """
-    try:
-        input_array = [int(i) for i in file.read().split()]
-    except ValueError:
-        raise click.UsageError("Only integers are allowed.")
+    --top streams FILE through a heap of size K, so memory use is O(K) however large FILE is.
+
+    \b
+    --pretty-print draws the first 7 levels (see --depth). --outline prints one line per key instead,
+    so any heap fits.
+
+    \b
+    --load memory maps a snapshot written by --save: the heap is not parsed or rebuilt
+    (its arity is stored in the snapshot).
+
+    \b
+    FILE is read in chunks and parsed in bulk (with NumPy, if installed).
 
-    heap = MaxHeap(input_array)
+    \b
+    --stats counts key comparisons (not with --compact or --top) and how many levels keys sift
+    (each level is one move), and times every operation. Without it, none of this costs anything.
 
+    \b
+    Arguments:
+      FILE -- Non-negative integers separated by newlines (or binary, see --input-format).
+    """
+    pretty_print = pretty_print or outline or depth is not None
     if pretty_print and sort:
         raise click.UsageError("Cannot use --pretty-print and --sort together.")
+    if top and (pretty_print or sort):
+        raise click.UsageError("Cannot use --top with --pretty-print (--depth, --outline) or --sort.")
+    if top and (save or compact or arity != 2):
+        raise click.UsageError("Cannot use --top with --save, --compact or --arity (only K integers are kept).")
+
+    stats = Stats() if show_stats else None
+    heap_class = stats.instrument(MaxHeap) if stats else MaxHeap
+
+    if top:
+        try:
+            if load:
+                integers = MaxHeap.load(load)._heap
+            else:
+                integers = chain.from_iterable(read_chunks(file, input_format))
+            click.echo(list_output(top_k(integers, top, heap_class)))
+        except ValueError as error:
+            raise click.UsageError(str(error))
+        echo_stats(stats)
+        return
+
+    if load:
+        try:
+            heap = heap_class.load(load, writable=sort)
+        except ValueError as error:
+            raise click.UsageError(str(error))
+    else:
+        try:
+            input_array = read_integers(file, input_format)
+        except ValueError as error:
+            raise click.UsageError(str(error))
+
+        if compact and not isinstance(input_array, array):
+            raise click.UsageError("--compact only holds 64 bit integers.")
+        # input_array is already packed (unless an integer is too big), so --compact just keeps it that way.
+        integers = input_array if compact or not isinstance(input_array, array) else input_array.tolist()
+        if stats and not compact:
+            integers = list(map(stats.key_type(), integers))
+        heap = heap_class(integers, arity=arity)
+
+    if save:
+        try:
+            heap.save(save)
+        except ValueError as error:
+            raise click.UsageError(str(error))
 
     if pretty_print:
-        heap.pretty_print()
+        heap.pretty_print(depth, outline)
     elif sort:
         click.echo(list_output(heap.sorted_array()))
     else:
         click.echo(list_output(heap._heap))
+    echo_stats(stats)
 
 
 @click.command()
 @click.option('--pretty-print', '-p', is_flag=True, help="Pretty print AVL tree.")
-@click.argument('file', type=click.File(), default='-', required=False)
-def avl(file, pretty_print):
+@click.option('--depth', '-d', type=click.IntRange(min=0), metavar='N',
+              help="Pretty print only the first N levels below the root (default 7, all with --outline).")
+@click.option('--outline', '-o', is_flag=True, help="Pretty print as an indented outline (one line per key, any height).")
+@click.option('--multiset', '-m', is_flag=True, help="Keep duplicate integers (counted, one node per distinct integer).")
+@click.option('--engine', '-e', type=click.Choice(sorted(ENGINES)), default='avl', show_default=True,
+              help="Balanced tree to use.")
+@click.option('--save', type=click.Path(dir_okay=False, writable=True), metavar='PATH',
+              help="Save the keys to a binary snapshot.")
+@click.option('--load', type=click.Path(exists=True, dir_okay=False), metavar='PATH',
+              help="Load a snapshot (from --save) instead of reading FILE.")
+@click.option('--input-format', '-f', type=click.Choice(INPUT_FORMATS), default='text', show_default=True,
+              help="text: integers separated by whitespace. binary: raw little endian 64 bit integers.")
+@click.option('--stats', 'show_stats', is_flag=True,
+              help="Print operation counts, sift depths/rotations and timings to stderr (slower).")
+@click.argument('file', type=click.File('rb'), default='-', required=False)
+def avl(file, pretty_print, depth, outline, multiset, engine, save, load, input_format, show_stats):
     """AVL Tree manipulation.
 
     \b
     The default behavior returns a sorted list (ascending). Each element is separated by a newline.
     This is accomplished by doing an 'in order' traversal of the AVL tree.
 
+    \b
+    Duplicates are dropped, unless --multiset is given.
+
+    \b
+    --engine picks the structure: avl, red-black (fewer rotations, for write heavy loads)
+    or blocks (a short list of sorted blocks of keys, no tree nodes, for read heavy loads).
+
+    \b
+    --pretty-print draws the first 7 levels (see --depth). --outline prints one line per key instead,
+    so any tree fits.
+
+    \b
+    --load memory maps a snapshot written by --save, so the sorted list is printed without
+    parsing or building a tree (multiset mode is stored in the snapshot).
+
+    \b
+    --stats counts key comparisons, rotations (by type, a zigzag is not also two single rotations),
+    rebalances (fixes that rotated) and node allocations,
+    and times every operation. Without it, none of this costs anything.
+
     \b
     Arguments:
-      FILE -- Distinct integers separated by newlines.
+      FILE -- Integers separated by newlines (or binary, see --input-format).
     """
-    try:
-        input_array = set([int(i) for i in file.read().split()])
-    except ValueError:
-        raise click.UsageError("Only distinct integers are allowed.")
+    stats = Stats() if show_stats else None
+    tree_class = stats.instrument(ENGINES[engine]) if stats else ENGINES[engine]
 
-    avl_tree = AVL(input_array)
+    if load:
+        try:
+            avl_tree = tree_class.load(load)
+        except ValueError as error:
+            raise click.UsageError(str(error))
+    else:
+        try:
+            input_array = read_integers(file, input_format)
+        except ValueError as error:
+            raise click.UsageError(str(error))
 
-    if pretty_print:
-        avl_tree.pretty_print()
+        if not multiset:
+            input_array = set(input_array)
+        if stats:
+            input_array = list(map(stats.key_type(), input_array))
+        avl_tree = tree_class(input_array, multiset=multiset)
+
+    if save:
+        try:
+            avl_tree.save(save)
+        except ValueError as error:
+            raise click.UsageError(str(error))
+
+    if pretty_print or outline or depth is not None:
+        avl_tree.pretty_print(depth, outline)
     else:
-        click.echo(list_output(avl_tree.in_order()))
+        stream_output(avl_tree)
+    echo_stats(stats)
+
+
+def echo_stats(stats):
+    """Echo stats (if any) to stderr, after the output."""
+    if stats:
+        click.echo(stats.report(), err=True)
 
 
 def list_output(integers):
     return "\n".join(str(i) for i in integers)
+
+
+def stream_output(integers, chunk_size=4096):
+    """Echo integers (one per line) in chunks, so output starts before the last integer is produced.
+
+    Writes the same text as click.echo(list_output(integers)).
+    """
+    iterator = iter(integers)
+    chunk = list_output(islice(iterator, chunk_size))
+    while True:
+        next_chunk = list_output(islice(iterator, chunk_size))
+        if not next_chunk:
+            break
+        click.echo(chunk)
+        chunk = next_chunk
+    click.echo(chunk)
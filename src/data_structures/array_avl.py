@@ -0,0 +1,282 @@
+from array import array
+
+from src.util.pretty_print import print_tree
+
+NIL = -1  # Node id of a missing child/parent.
+
+
+class ArrayAVL:
+    """An AVL tree stored as a struct of arrays (no node objects).
+
+    Node i is (key[i], left[i], right[i], parent[i], height[i]), each kept in its own packed array.
+    Links are node ids (NIL for none). A node costs about 21 bytes instead of a Node object
+    plus its boxed attributes, and the garbage collector has nothing to traverse.
+
+    Same insert/delete algorithms as AVL, so the same shapes as an AVL built by repeated insert
+    (AVL.__init__ bulk loads instead). Deleted ids are recycled through a free list threaded
+    through the left array.
+
+    Distinct integers. left <= node < right.
+
+    Attributes:
+        root (int): Node id of the root (NIL if empty).
+        size (int): Size of tree (number of nodes).
+    """
+
+    def __init__(self, integers):
+        """Initialize AVL tree.
+
+        :param integers: A list (of distinct integers) to make an AVL tree.
+        """
+        self._key = array('q')
+        self._left = array('i')
+        self._right = array('i')
+        self._parent = array('i')
+        self._height = array('b')
+        self._free = NIL  # Head of the free list.
+
+        self.root = NIL
+        self.size = 0
+
+        for i in integers:
+            self.insert(i)
+
+    def key(self, node):
+        """Return the key of node."""
+        return self._key[node]
+
+    def search(self, value):
+        """Search for value in tree.
+
+        :param value: Value to search for.
+        :return:      If exists, return id of node with value. Otherwise, return None.
+        """
+        key, left, right = self._key, self._left, self._right
+        node = self.root
+        while node != NIL and key[node] != value:
+            node = left[node] if value <= key[node] else right[node]
+        return None if node == NIL else node
+
+    def insert(self, value):
+        """Insert value into tree.
+
+        :param value: The value to insert into the tree.
+        """
+        self.size += 1
+        new_node = self._new_node(value)
+        if self.root == NIL:
+            self.root = new_node
+            return
+
+        key, left, right = self._key, self._left, self._right
+        curr_node = self.root
+        while True:
+            if value <= key[curr_node]:
+                if left[curr_node] != NIL:
+                    curr_node = left[curr_node]
+                else:
+                    left[curr_node] = new_node
+                    break
+            else:
+                if right[curr_node] != NIL:
+                    curr_node = right[curr_node]
+                else:
+                    right[curr_node] = new_node
+                    break
+        self._parent[new_node] = curr_node
+
+        self._retrace(curr_node)
+
+    def delete(self, value):
+        """Delete value from tree.
+
+        A node with two children takes its predecessor's key, and the predecessor
+        (which has no right child) is spliced out instead.
+
+        :param value: The value to delete from the tree.
+        :return:      If exists, return value. Otherwise, return None.
+        """
+        node = self.search(value)
+        if node is None:
+            return None
+
+        left, right = self._left, self._right
+        if left[node] != NIL and right[node] != NIL:
+            predecessor = left[node]
+            while right[predecessor] != NIL:
+                predecessor = right[predecessor]
+            self._key[node] = self._key[predecessor]
+            node = predecessor
+
+        child = left[node] if left[node] != NIL else right[node]
+        parent = self._parent[node]
+        self._replace_child(parent, node, child)
+        if child != NIL:
+            self._parent[child] = parent
+
+        self.size -= 1
+        self._release(node)
+        self._retrace(parent)
+        return value
+
+    def in_order(self):
+        """In order traversal of tree.
+
+        :return: List of elements visited 'in order'.
+        """
+        return list(self.iter_in_order())
+
+    def __iter__(self):
+        """Iterate over elements 'in order' (lazily)."""
+        return self.iter_in_order()
+
+    def iter_in_order(self):
+        """Lazy in order traversal (ascending). Explicit stack, O(h) extra memory."""
+        key, left, right = self._key, self._left, self._right
+        stack = []
+        node = self.root
+        while stack or node != NIL:
+            while node != NIL:
+                stack.append(node)
+                node = left[node]
+            node = stack.pop()
+            yield key[node]
+            node = right[node]
+
+    def height(self):
+        """Return height of tree."""
+        return self.node_height(self.root)
+
+    def node_height(self, node):
+        """Return height of node."""
+        return self._height[node] if node != NIL else -1
+
+    def set_node_height(self, node):
+        """Set node height to max(left height, right height) + 1."""
+        self._height[node] = max(self.node_height(self._left[node]), self.node_height(self._right[node])) + 1
+
+    def subtree_height_diff(self, node):
+        """Get difference in height between left and right subtrees (> 0 if left is heavy)."""
+        return self.node_height(self._left[node]) - self.node_height(self._right[node])
+
+    def _new_node(self, value):
+        """Return id of a new leaf holding value. Reuses a freed id if there is one."""
+        node = self._free
+        if node != NIL:
+            self._free = self._left[node]
+            self._key[node] = value
+            self._left[node] = self._right[node] = self._parent[node] = NIL
+            self._height[node] = 0
+        else:
+            node = len(self._key)
+            self._key.append(value)
+            self._left.append(NIL)
+            self._right.append(NIL)
+            self._parent.append(NIL)
+            self._height.append(0)
+        return node
+
+    def _release(self, node):
+        """Push node id onto the free list."""
+        self._left[node] = self._free
+        self._free = node
+
+    def _replace_child(self, parent, old_child, new_child):
+        """Point parent (or root, if parent is NIL) at new_child instead of old_child."""
+        if parent == NIL:
+            self.root = new_child
+        elif self._left[parent] == old_child:
+            self._left[parent] = new_child
+        else:
+            self._right[parent] = new_child
+
+    def _retrace(self, node):
+        """Walk from node up to the root, maintaining node heights and rebalancing (see AVL._retrace).
+
+        :param node: The lowest node whose subtree changed.
+        """
+        while node != NIL:
+            old_height = self._height[node]
+            self.set_node_height(node)
+            subtree_root = self._balance_node(node)
+            if self._height[subtree_root] == old_height:
+                break
+            node = self._parent[subtree_root]
+
+    def _balance_node(self, node):
+        """Balance node (see AVL._balance_node).
+
+        :param node: The node to balance.
+        :return:     The root of the (balanced) subtree that node was the root of.
+        """
+        diff = self.subtree_height_diff(node)
+        if diff > 1:
+            if self.subtree_height_diff(self._left[node]) < 0:
+                self.left_rotate(self._left[node])  # zigzag
+            return self.right_rotate(node)
+        elif diff < -1:
+            if self.subtree_height_diff(self._right[node]) > 0:
+                self.right_rotate(self._right[node])  # zagzig
+            return self.left_rotate(node)
+        return node
+
+    def left_rotate(self, node):
+        """Left rotate.
+
+        :param node: The node to rotate left.
+        :return:     The new root of the subtree (node's old right child).
+        """
+        left, right, parent = self._left, self._right, self._parent
+        node_x = node
+        node_y = right[node_x]
+        if node_y == NIL:
+            raise Exception("Cannot rotate left.")
+
+        self._replace_child(parent[node_x], node_x, node_y)
+        parent[node_y] = parent[node_x]
+        parent[node_x] = node_y
+        right[node_x] = left[node_y]
+        if right[node_x] != NIL:
+            parent[right[node_x]] = node_x
+        left[node_y] = node_x
+
+        self.set_node_height(node_x)
+        self.set_node_height(node_y)
+        return node_y
+
+    def right_rotate(self, node):
+        """Right rotate.
+
+        :param node: The node to rotate right.
+        :return:     The new root of the subtree (node's old left child).
+        """
+        left, right, parent = self._left, self._right, self._parent
+        node_x = node
+        node_y = left[node_x]
+        if node_y == NIL:
+            raise Exception("Cannot rotate right.")
+
+        self._replace_child(parent[node_x], node_x, node_y)
+        parent[node_y] = parent[node_x]
+        parent[node_x] = node_y
+        left[node_x] = right[node_y]
+        if left[node_x] != NIL:
+            parent[left[node_x]] = node_x
+        right[node_y] = node_x
+
+        self.set_node_height(node_x)
+        self.set_node_height(node_y)
+        return node_y
+
+    def pretty_print(self, max_depth=None, outline=False):
+        """Pretty print AVL tree (see BST.pretty_print)."""
+        if self.root == NIL:
+            print("Tree is empty.")
+            return
+
+        left, right, key = self._left, self._right, self._key
+
+        def children(node):
+            return (left[node] if left[node] != NIL else None, right[node] if right[node] != NIL else None)
+
+        print_tree(self.root, children, lambda node: str(key[node]), max_depth, outline)
@@ -7,86 +7,41 @@ class AVL(BST):
     Distinct integers. left <= node < right.
 
     Attributes:
-        root (Node): Root of tree.
-        size  (int): Size of tree (number of nodes).
+        root     (Node): Root of tree.
+        size      (int): Size of tree (number of keys, counting duplicates).
+        multiset (bool): Count duplicates in a single node (see BST).
     """
 
-    def __init__(self, integers):
-        BST.__init__(self, integers)
+    def __init__(self, integers, multiset=False):
+        """Initialize AVL tree.
 
-    def _insert_helper(self, curr_node, new_node):
-        """Perform binary search on AVL tree and insert new_node.
+        The tree is built in one go with bulk_load: O(n) if integers are sorted, O(n lg(n)) otherwise.
 
-        ASSERT: curr_node is not None.
-
-        After insertion, retain AVL rep invariant (keep it balanced).
-
-        :param curr_node: Current node in AVL tree while traversing.
-        :param new_node:  The node to insert.
+        :param integers: A list (of distinct integers) to make an AVL tree.
+        :param multiset: Count duplicates in a single node.
         """
-        if new_node.data <= curr_node.data:
-            if curr_node.left:
-                # Traverse left.
-                self._insert_helper(curr_node.left, new_node)
-            else:
-                # Insert left.
-                curr_node.left = new_node
-                new_node.parent = curr_node
-        else:
-            if curr_node.right:
-                # Traverse right.
-                self._insert_helper(curr_node.right, new_node)
-            else:
-                # Insert right.
-                curr_node.right = new_node
-                new_node.parent = curr_node
-
-        # Maintain node height.
-        self.set_node_height(curr_node)
+        self.root = None
+        self.size = 0
+        self.multiset = multiset
+        self.bulk_load(integers)
 
-        self._balance_node(curr_node)
+    def _retrace(self, node):
+        """Walk from node up to the root, maintaining node heights and rebalancing.
 
-    def _delete_helper(self, curr_node, value):
-        """Perform binary search on AVL tree and delete node with value.
+        Retain AVL rep invariant (keep it balanced) after an insertion or deletion below node.
+        Once a (balanced) subtree keeps its old height, nothing above it needs rebalancing,
+        so only sizes are left to fix.
 
-        After insertion, retain AVL rep invariant (keep it balanced).
-
-        :param curr_node: Current node in AVL tree while traversing.
-        :param value:     The value to delete from the BST.
-        :return:          If exists, return value. Otherwise, return None.
+        :param node: The lowest node whose subtree changed.
         """
-        if not curr_node:
-            return None  # Node with value does not exist.
-
-        if curr_node.data != value:
-            # Have not found node to delete. Continue traversing.
-            result = None
-
-            if value <= curr_node.data:
-                result = self._delete_helper(curr_node.left, value)
-            else:
-                result = self._delete_helper(curr_node.right, value)
-
-            # Maintain node height.
-            self.set_node_height(curr_node)
-
-            self._balance_node(curr_node)
-
-            return result
-        else:
-            # Delete curr_node.
-            if curr_node.left and curr_node.right:
-                self._delete_helper_children_and(curr_node)
-            else:
-                child = self._get_single_child(curr_node)
-                self._delete_helper_children_nand(curr_node, child)
-
-            # Maintain node height.
-            self.set_node_height(curr_node)
-
-            self._balance_node(curr_node)
-
-            return value  # Because we found value to be deleted.
+        while node:
+            old_height = node.height
+            self.update_node(node)
+            subtree_root = self._balance_node(node)
+            if subtree_root.height == old_height:
+                self._update_sizes(subtree_root.parent)
+                break
+            node = subtree_root.parent
 
     def _balance_node(self, node):
         """Balance node.
@@ -95,6 +50,7 @@ class AVL(BST):
             |left subtree height - right subtree height| <= 1
 
         :param node: The node to balance.
+        :return:     The root of the (balanced) subtree that node was the root of.
         """
         diff = self.subtree_height_diff(node)
         if diff > 1:
@@ -104,6 +60,7 @@ class AVL(BST):
                 self.right_rotate(node)
             else:
                 self.zigzag(node)
+            return node.parent
         elif diff < -1:
             # Right subtree heavy.
             right_diff = self.subtree_height_diff(node.right)
@@ -111,6 +68,8 @@ class AVL(BST):
                 self.left_rotate(node)
             else:
                 self.zagzig(node)
+            return node.parent
+        return node
 
     def subtree_height_diff(self, node):
         """Get difference in height between left and right subtrees.
@@ -128,66 +87,6 @@ class AVL(BST):
         right_height = self.node_height(node.right)
         return left_height - right_height
 
-    def left_rotate(self, node):
-        """Left rotate.
-
-        :param node: The node to rotate left.
-        """
-        node_x = node
-        node_y = node.right
-
-        if not node_y:
-            raise Exception("Cannot rotate left.")
-
-        # Maintain pointers.
-        if node_x == self.root:
-            self.root = node_y
-        elif node_x.data <= node_x.parent.data:
-            node_x.parent.left = node_y
-        else:
-            node_x.parent.right = node_y
-
-        node_y.parent = node_x.parent
-        node_x.parent = node_y
-        node_x.right = node_y.left
-        if node_x.right:
-            node_x.right.parent = node_x
-        node_y.left = node_x
-
-        # Maintain node heights.
-        self.set_node_height(node_x)
-        self.set_node_height(node_y)
-
-    def right_rotate(self, node):
-        """Right rotate.
-
-        :param node: The node to rotate right.
-        """
-        node_x = node
-        node_y = node.left
-
-        if not node_y:
-            raise Exception("Cannot rotate right.")
-
-        # Maintain pointers.
-        if node_x == self.root:
-            self.root = node_y
-        elif node_x.data <= node_x.parent.data:
-            node_x.parent.left = node_y
-        else:
-            node_x.parent.right = node_y
-
-        node_y.parent = node_x.parent
-        node_x.parent = node_y
-        node_x.left = node_y.right
-        if node_x.left:
-            node_x.left.parent = node_x
-        node_y.right = node_x
-
-        # Maintain node heights.
-        self.set_node_height(node_x)
-        self.set_node_height(node_y)
-
     def zigzag(self, node):
         """Zigzag.
 
@@ -225,3 +124,210 @@ class AVL(BST):
 
         self.right_rotate(node.right)
         self.left_rotate(node)
+
+    # Join-based set operations.
+    #
+    # All of them are built on _join(left, node, right), which glues two AVL trees and a middle node
+    # by walking down the spine of the taller tree to the height of the shorter one: O(|height difference|).
+    # They work on detached subtrees (roots with parent None) and reuse the nodes of their inputs,
+    # so the trees passed in are consumed. In multiset mode, counts are added (union),
+    # take the min (intersection) or are subtracted (difference).
+
+    @classmethod
+    def join(cls, left, key, right):
+        """Return an AVL tree of left's keys, key and right's keys. Runs in O(lg(n)) time.
+
+        left and right are consumed (both empty afterwards).
+
+        :param left:  AVL tree with keys < key.
+        :param key:   The middle key.
+        :param right: AVL tree with keys > key.
+        """
+        if (left.root and left.max() >= key) or (right.root and right.min() <= key):
+            raise ValueError("Cannot join: keys must be ordered left < key < right.")
+        left_root, right_root = left._take(), right._take()
+        tree = cls([], multiset=left.multiset)
+        tree._set_root(tree._join(left_root, cls.node_class(key), right_root))
+        return tree
+
+    def split(self, key):
+        """Split into (tree of keys < key, True if key was in the tree, tree of keys > key). O(lg(n)).
+
+        Every copy of key is dropped (without multiset, duplicates are separate nodes).
+        This tree is consumed (empty afterwards).
+        """
+        left, found, right = self._split(self._take(), key, all_copies=True)
+        left_tree, right_tree = type(self)([], self.multiset), type(self)([], self.multiset)
+        left_tree._set_root(left)
+        right_tree._set_root(right)
+        return left_tree, found is not None, right_tree
+
+    def union(self, other):
+        """Add every key of other to this tree. Runs in O(m lg(n / m + 1)) time (m <= n).
+
+        other is consumed (empty afterwards).
+        """
+        self._set_root(self._union(self._take(), other._take()))
+
+    def intersection(self, other):
+        """Keep only keys that are also in other. Runs in O(m lg(n / m + 1)) time (m <= n).
+
+        other is consumed (empty afterwards).
+        """
+        self._set_root(self._intersection(self._take(), other._take()))
+
+    def difference(self, other):
+        """Remove every key that is in other. Runs in O(m lg(n / m + 1)) time (m <= n).
+
+        other is consumed (empty afterwards).
+        """
+        self._set_root(self._difference(self._take(), other._take()))
+
+    def _take(self):
+        """Detach and return the root, leaving this tree empty."""
+        root = self.root
+        self.root = None
+        self.size = 0
+        return root
+
+    def _set_root(self, root):
+        """Make root (of a detached subtree) the root of this tree."""
+        if root:
+            root.parent = None
+        self.root = root
+        self.size = self.node_size(root)
+
+    def _detach_children(self, node):
+        """Detach and return (left, right) subtrees of node."""
+        left, right = node.left, node.right
+        node.left = node.right = None
+        if left:
+            left.parent = None
+        if right:
+            right.parent = None
+        return left, right
+
+    def _join(self, left, node, right):
+        """Join detached AVL trees left and right with node in the middle.
+
+        ASSERT: keys in left <= node.data <= keys in right.
+
+        :return: Root of the joined tree.
+        """
+        left_height, right_height = self.node_height(left), self.node_height(right)
+        if left_height > right_height + 1:
+            # Walk down the right spine of left until the heights are close, hang node there.
+            parent, child = None, left
+            while self.node_height(child) > right_height + 1:
+                parent, child = child, child.right
+            node.left, node.right = child, right
+            parent.right = node
+        elif right_height > left_height + 1:
+            # Walk down the left spine of right.
+            parent, child = None, right
+            while self.node_height(child) > left_height + 1:
+                parent, child = child, child.left
+            node.left, node.right = left, child
+            parent.left = node
+        else:
+            parent = None
+            node.left, node.right = left, right
+
+        node.parent = parent
+        if node.left:
+            node.left.parent = node
+        if node.right:
+            node.right.parent = node
+        return self._rebalance_to_top(node)
+
+    def _rebalance_to_top(self, node):
+        """Maintain heights and sizes and rebalance from node up to the top of its (detached) tree.
+
+        :return: Root of the tree.
+        """
+        while True:
+            self.update_node(node)
+            node = self._balance_node(node)
+            if node.parent is None:
+                return node
+            node = node.parent
+
+    def _join2(self, left, right):
+        """Join detached AVL trees left and right (keys in left <= keys in right), no middle node."""
+        if not left:
+            return right
+        left, last = self._split_last(left)
+        return self._join(left, last, right)
+
+    def _split_last(self, node):
+        """Remove the max node from the detached tree rooted at node.
+
+        :return: (root of the remaining tree, max node (detached)).
+        """
+        left, right = self._detach_children(node)
+        if not right:
+            return left, node
+        right, last = self._split_last(right)
+        return self._join(left, node, right), last
+
+    def _split(self, node, key, all_copies=False):
+        """Split the detached tree rooted at node around key.
+
+        :param all_copies: Also drop the other copies of key (they can be on either side of the first one found).
+        :return: (root of keys < key, node with key (detached) or None, root of keys > key).
+        """
+        if not node:
+            return None, None, None
+
+        left, right = self._detach_children(node)
+        if key == node.data:
+            if all_copies:
+                left = self._split(left, key, True)[0]
+                right = self._split(right, key, True)[2]
+            return left, node, right
+        elif key < node.data:
+            less, found, greater = self._split(left, key, all_copies)
+            return less, found, self._join(greater, node, right)
+        else:
+            less, found, greater = self._split(right, key, all_copies)
+            return self._join(left, node, less), found, greater
+
+    def _union(self, node_a, node_b):
+        """Return root of the union of detached trees node_a and node_b (split a around b's root)."""
+        if not node_a:
+            return node_b
+        if not node_b:
+            return node_a
+        left_b, right_b = self._detach_children(node_b)
+        left_a, found, right_a = self._split(node_a, node_b.data)
+        if found and self.multiset:
+            node_b.count += found.count
+        return self._join(self._union(left_a, left_b), node_b, self._union(right_a, right_b))
+
+    def _intersection(self, node_a, node_b):
+        """Return root of the intersection of detached trees node_a and node_b."""
+        if not node_a or not node_b:
+            return None
+        left_b, right_b = self._detach_children(node_b)
+        left_a, found, right_a = self._split(node_a, node_b.data)
+        left = self._intersection(left_a, left_b)
+        right = self._intersection(right_a, right_b)
+        if found:
+            node_b.count = min(node_b.count, found.count)
+            return self._join(left, node_b, right)
+        else:
+            return self._join2(left, right)
+
+    def _difference(self, node_a, node_b):
+        """Return root of detached tree node_a minus the keys of detached tree node_b."""
+        if not node_a:
+            return None
+        if not node_b:
+            return node_a
+        left_b, right_b = self._detach_children(node_b)
+        left_a, found, right_a = self._split(node_a, node_b.data)
+        left, right = self._difference(left_a, left_b), self._difference(right_a, right_b)
+        if found and found.count > node_b.count:
+            found.count -= node_b.count
+            return self._join(left, found, right)
+        return self._join2(left, right)
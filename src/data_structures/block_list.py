@@ -0,0 +1,260 @@
+from bisect import bisect_left, bisect_right, insort
+from itertools import accumulate, chain, islice
+
+from src.data_structures.order_statistics import OrderStatistics
+from src.data_structures.snapshot import TreeSnapshot, save_tree
+
+BLOCK_SIZE = 512  # Keys per block after a split or a bulk load. Blocks split at twice this.
+
+
+class BlockList(OrderStatistics):
+    """A sorted list of integers, stored as a short list of sorted blocks (wide nodes).
+
+    Same public API as BST (insert, delete, search, navigation, range, order statistics),
+    except that search returns the key instead of a node (there are no nodes).
+
+    Instead of one heap-allocated node per key, keys live in Python lists of up to
+    2 * BLOCK_SIZE keys. A lookup is a bisect over the block maxes, then a bisect inside
+    one block: two binary searches, with no node objects (parent/left/right links) to walk
+    through. The lists still hold references to boxed ints, so each key compared is one
+    pointer dereference, as in a tree.
+
+    Insert and delete shift at most one block (O(BLOCK_SIZE) memmove, which is fast),
+    plus O(n / BLOCK_SIZE) to keep _maxes up to date on a split or when a block empties.
+
+    Duplicates are kept as repeated keys, with or without multiset (the flag exists so
+    BlockList can be swapped in for BST and AVL).
+
+    Attributes:
+        _blocks (list): Sorted blocks (lists). Never contains an empty block.
+        _maxes  (list): Largest key of each block.
+        _index  (list): Number of keys before each block, or None if it has to be rebuilt.
+        size     (int): Size of list (number of keys, counting duplicates).
+        multiset (bool): Accepted for compatibility with BST. Duplicates are always kept.
+    """
+
+    def __init__(self, integers, multiset=False):
+        """Initialize block list.
+
+        :param integers: An iterable (of integers) to make a block list.
+        :param multiset: Accepted for compatibility with BST.
+        """
+        self._blocks = []
+        self._maxes = []
+        self._index = None
+        self.size = 0
+        self.multiset = multiset
+        self.bulk_load(integers)
+
+    def bulk_load(self, integers):
+        """Insert many integers at once: sort everything, then cut it into full blocks. O(n lg(n))."""
+        integers = sorted(chain(self, integers))
+        self._blocks = [integers[i:i + BLOCK_SIZE] for i in range(0, len(integers), BLOCK_SIZE)]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._index = None
+        self.size = len(integers)
+
+    @classmethod
+    def load(cls, path):
+        """Memory map a snapshot saved with save(). Read-only queries start without rebuilding anything.
+
+        :param path: Snapshot file.
+        :return:     A TreeSnapshot (same read API). Call thaw() on it to get a BlockList back.
+        """
+        return TreeSnapshot(path, cls)
+
+    def save(self, path):
+        """Save the keys to path, in order (see snapshot.save_tree). Load with load()."""
+        save_tree(path, self)
+
+    def _locate(self, value):
+        """Return (block position, index in block) of the first key >= value.
+
+        If every key is < value, return (number of blocks, 0).
+        """
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return pos, 0
+        return pos, bisect_left(self._blocks[pos], value)
+
+    def search(self, value):
+        """Search for value. Runs in O(lg(n)) time.
+
+        :param value: Value to search for.
+        :return:      If exists, return value (BST.search returns its node). Otherwise, return None.
+        """
+        pos, i = self._locate(value)
+        if pos < len(self._blocks) and self._blocks[pos][i] == value:
+            return value
+        return None
+
+    def insert(self, value):
+        """Insert value. Splits the block if it grows past 2 * BLOCK_SIZE.
+
+        :param value: The value to insert.
+        """
+        self.size += 1
+        self._index = None
+        if not self._blocks:
+            self._blocks.append([value])
+            self._maxes.append(value)
+            return
+
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            # Larger than every key: append to the last block.
+            pos -= 1
+            self._blocks[pos].append(value)
+            self._maxes[pos] = value
+        else:
+            insort(self._blocks[pos], value)
+
+        block = self._blocks[pos]
+        if len(block) > 2 * BLOCK_SIZE:
+            self._blocks.insert(pos + 1, block[BLOCK_SIZE:])
+            del block[BLOCK_SIZE:]
+            self._maxes.insert(pos, block[-1])
+
+    def delete(self, value):
+        """Delete (one copy of) value.
+
+        :param value: The value to delete.
+        :return:      If exists, return value. Otherwise, return None.
+        """
+        pos, i = self._locate(value)
+        if pos == len(self._blocks) or self._blocks[pos][i] != value:
+            return None  # value does not exist.
+
+        block = self._blocks[pos]
+        del block[i]
+        self.size -= 1
+        self._index = None
+        if not block:
+            del self._blocks[pos]
+            del self._maxes[pos]
+        elif i == len(block):
+            self._maxes[pos] = block[-1]
+        return value
+
+    def min(self):
+        """Return the smallest key, or None if the list is empty."""
+        return self._blocks[0][0] if self._blocks else None
+
+    def max(self):
+        """Return the largest key, or None if the list is empty."""
+        return self._maxes[-1] if self._maxes else None
+
+    def floor(self, value):
+        """Return the largest key <= value, or None if there is none. Runs in O(lg(n)) time."""
+        pos = bisect_right(self._maxes, value)
+        if pos < len(self._maxes):
+            block = self._blocks[pos]
+            i = bisect_right(block, value)
+            if i:
+                return block[i - 1]
+        return self._maxes[pos - 1] if pos else None
+
+    def ceiling(self, value):
+        """Return the smallest key >= value, or None if there is none. Runs in O(lg(n)) time."""
+        pos, i = self._locate(value)
+        return self._blocks[pos][i] if pos < len(self._blocks) else None
+
+    def predecessor(self, value):
+        """Return the largest key < value, or None if there is none. Runs in O(lg(n)) time.
+
+        value does not have to be in the list.
+        """
+        pos, i = self._locate(value)
+        if i:
+            return self._blocks[pos][i - 1]
+        return self._maxes[pos - 1] if pos else None
+
+    def successor(self, value):
+        """Return the smallest key > value, or None if there is none. Runs in O(lg(n)) time.
+
+        value does not have to be in the list.
+        """
+        pos = bisect_right(self._maxes, value)
+        if pos == len(self._maxes):
+            return None
+        block = self._blocks[pos]
+        return block[bisect_right(block, value)]
+
+    def range(self, lo, hi):
+        """Lazily yield every key x with lo <= x <= hi (ascending). Runs in O(lg(n) + k) time for k keys."""
+        pos, i = self._locate(lo)
+        for block in islice(self._blocks, pos, None):
+            if block[-1] <= hi:
+                yield from islice(block, i, None)
+            else:
+                yield from islice(block, i, bisect_right(block, hi))
+                return
+            i = 0
+
+    def in_order(self):
+        """Return all keys in ascending order (a new list)."""
+        return list(chain.from_iterable(self._blocks))
+
+    def __iter__(self):
+        """Iterate over keys in ascending order (lazily)."""
+        return self.iter_in_order()
+
+    def iter_in_order(self):
+        """Lazy traversal (ascending)."""
+        return chain.from_iterable(self._blocks)
+
+    def iter_reverse_order(self):
+        """Lazy traversal (descending)."""
+        return chain.from_iterable(map(reversed, reversed(self._blocks)))
+
+    def height(self):
+        """Return height, counting the block list as a root with the blocks as leaves.
+
+        -1 if empty, 0 for a single block, otherwise 1.
+        """
+        return min(len(self._blocks), 2) - 1
+
+    def _offsets(self):
+        """Return the number of keys before each block. Rebuilt in O(n / BLOCK_SIZE) after a change."""
+        if self._index is None:
+            self._index = [0]
+            self._index.extend(accumulate(map(len, self._blocks[:-1])))
+        return self._index
+
+    def rank(self, value):
+        """Return the number of keys < value. Runs in O(lg(n)) time (when the index is up to date)."""
+        pos, i = self._locate(value)
+        if pos == len(self._blocks):
+            return self.size
+        return self._offsets()[pos] + i
+
+    def _rank_less_equal(self, value):
+        """Return the number of keys <= value."""
+        pos = bisect_right(self._maxes, value)
+        if pos == len(self._maxes):
+            return self.size
+        return self._offsets()[pos] + bisect_right(self._blocks[pos], value)
+
+    def select(self, k):
+        """Return the k-th smallest key (k = 0 is the min).
+
+        :param k: Rank of the key to return.
+        :return:  If 0 <= k < size, return the key. Otherwise, return None.
+        """
+        if not 0 <= k < self.size:
+            return None
+        offsets = self._offsets()
+        pos = bisect_right(offsets, k) - 1
+        return self._blocks[pos][k - offsets[pos]]
+
+    def pretty_print(self, max_depth=None, outline=False):
+        """Pretty print block list (one block per line, one write). Same signature as BST.pretty_print.
+
+        :param max_depth: Ignored (a block list only has one level of blocks).
+        :param outline:   Ignored (the output is already one line per block).
+        """
+        if not self._blocks:
+            print("Tree is empty.")
+            return
+
+        print("\n".join("[{}] {}".format(pos, " ".join(map(str, block))) for pos, block in enumerate(self._blocks)))
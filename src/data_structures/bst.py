@@ -1,105 +1,203 @@
-from src.util.pretty_print import get_spaces_array, print_slashes
+from collections import deque
+from collections.abc import Sequence
+from heapq import merge
+from itertools import groupby, islice, repeat
+
+from src.data_structures.snapshot import TreeSnapshot, save_tree
+from src.data_structures.tree_reads import TreeReads
 
 
 class Node:
     """Node in a binary tree.
 
+    Uses __slots__ (no per-instance __dict__): on CPython 3.11 a node takes 88 bytes instead of 136 (about 35% less).
+
     Attributes:
         left   (Node): Left child.
         right  (Node): Right child.
         parent (Node): Parent.
         data    (int): Data contained in the node.
         height  (int): Height of node in tree.
+        count   (int): Number of copies of data (always 1 unless the tree is a multiset).
+        size    (int): Number of keys (sum of counts) in the subtree rooted at this node.
     """
 
-    def __init__(self, key):
+    __slots__ = ('data', 'left', 'right', 'parent', 'height', 'count', 'size')
+
+    def __init__(self, key, count=1):
         self.data = key
         self.left, self.right, self.parent = None, None, None
         self.height = 0
+        self.count = count
+        self.size = count
 
 
-class BST:
+class BST(TreeReads):
     """A BST with all the fixings.
 
     Distinct integers. left <= node < right.
 
+    In multiset mode, duplicates share one node that counts them: inserting an existing key
+    bumps its count (no allocation, no rebalancing), and traversals repeat it count times.
+
     Attributes:
-        root (Node): Root of tree.
-        size  (int): Size of tree (number of nodes).
+        root     (Node): Root of tree.
+        size      (int): Size of tree (number of keys, counting duplicates).
+        multiset (bool): Count duplicates in a single node.
     """
 
-    def __init__(self, integers):
+    node_class = Node  # Subclasses can use a Node subclass with more fields.
+
+    def __init__(self, integers, multiset=False):
         """Initialize BST.
 
         :param integers: A list (of distinct integers) to make a BST.
+        :param multiset: Count duplicates in a single node.
         """
         self.root = None
         self.size = 0
+        self.multiset = multiset
 
         for i in integers:
             self.insert(i)
 
-    def search(self, value):
-        """Search for value in BST.
+    def bulk_load(self, integers):
+        """Insert many integers at once by building a perfectly balanced tree.
 
-        :param value: Value to search for.
-        :return:      If exists, return node with value. Otherwise, return None.
+        Sort once (skipped if integers are already sorted), merge with the keys already in the tree,
+        then build the tree directly, middle key first. O(n) after the sort, and no rotations.
+
+        :param integers: The integers to insert.
         """
-        return self._search_helper(self.root, value)
+        if not (isinstance(integers, Sequence) and _is_sorted(integers)):
+            integers = sorted(integers)
+        if self.root:
+            integers = list(merge(self.in_order(), integers))
+        size = len(integers)
+
+        counts = None
+        if self.multiset:
+            runs = [(key, len(list(run))) for key, run in groupby(integers)]
+            integers = [key for key, _ in runs]
+            counts = [count for _, count in runs]
+
+        self.root = self._build_balanced(integers, 0, len(integers), counts)
+        self.size = size
+
+    def _build_balanced(self, integers, lo, hi, counts=None):
+        """Build a perfectly balanced tree from sorted integers[lo:hi].
+
+        Recursion depth is only lg(n).
+
+        :param counts: Count of each key (multiset mode), or None.
+        :return:       Root of the tree (parent not set), or None if the range is empty.
+        """
+        if lo >= hi:
+            return None
+
+        mid = (lo + hi) >> 1
+        node = self.node_class(integers[mid], counts[mid] if counts else 1)
+        node.left = self._build_balanced(integers, lo, mid, counts)
+        node.right = self._build_balanced(integers, mid + 1, hi, counts)
+        if node.left:
+            node.left.parent = node
+        if node.right:
+            node.right.parent = node
+
+        # Maintain node height and size.
+        self.update_node(node)
+        return node
+
+    @classmethod
+    def load(cls, path):
+        """Memory map a snapshot saved with save(). Read-only queries start without rebuilding anything.
+
+        :param path: Snapshot file.
+        :return:     A TreeSnapshot (same read API). Call thaw() on it to get a tree of this class back.
+        """
+        return TreeSnapshot(path, cls)
+
+    def save(self, path):
+        """Save the keys to path, in order (see snapshot.save_tree). Load with load()."""
+        save_tree(path, self)
 
-    def _search_helper(self, node, value):
-        """Perform binary search on BST.
+    def search(self, value):
+        """Search for value in BST (binary search, iterative).
 
-        :param node:  Current node to compare.
         :param value: Value to search for.
         :return:      If exists, return node with value. Otherwise, return None.
         """
-        if node is None or node.data == value:
-            return node
-        else:
-            if value <= node.data:
-                return self._search_helper(node.left, value)
-            else:
-                return self._search_helper(node.right, value)
+        node = self.root
+        while node is not None and node.data != value:
+            node = node.left if value <= node.data else node.right
+        return node
 
     def insert(self, value):
         """Insert value into BST.
 
+        Walk down to the leaf position of value, attach a new node there, then walk back
+        up through parent pointers (see _retrace). No recursion, so skewed trees are fine.
+
+        In multiset mode, if value is already in the tree, just count it.
+
         :param value: The value to insert into the BST.
         """
         self.size += 1
         if not self.root:
-            self.root = Node(value)
-        else:
-            self._insert_helper(self.root, Node(value))
+            self.root = self.node_class(value)
+            self._inserted(self.root)
+            return
+
+        multiset = self.multiset
+        curr_node = self.root
+        while True:
+            if multiset and value == curr_node.data:
+                curr_node.count += 1
+                self._update_sizes(curr_node)
+                return
+            if value <= curr_node.data:
+                if curr_node.left:
+                    curr_node = curr_node.left  # Traverse left.
+                else:
+                    new_node = curr_node.left = self.node_class(value)  # Insert left.
+                    break
+            else:
+                if curr_node.right:
+                    curr_node = curr_node.right  # Traverse right.
+                else:
+                    new_node = curr_node.right = self.node_class(value)  # Insert right.
+                    break
+        new_node.parent = curr_node
 
-    def _insert_helper(self, curr_node, new_node):
-        """Perform binary search on BST and insert new_node.
+        self._inserted(new_node)
 
-        ASSERT: curr_node is not None.
+    def _inserted(self, node):
+        """Called after a new leaf node is attached. Retrace from its parent.
 
-        :param curr_node: Current node in BST while traversing.
-        :param new_node:  The node to insert.
+        :param node: The new node.
         """
-        if new_node.data <= curr_node.data:
-            if curr_node.left:
-                # Traverse left.
-                self._insert_helper(curr_node.left, new_node)
-            else:
-                # Insert left.
-                curr_node.left = new_node
-                new_node.parent = curr_node
-        else:
-            if curr_node.right:
-                # Traverse right.
-                self._insert_helper(curr_node.right, new_node)
-            else:
-                # Insert right.
-                curr_node.right = new_node
-                new_node.parent = curr_node
+        self._retrace(node.parent)
 
-        # Maintain node height.
-        self.set_node_height(curr_node)
+    def _retrace(self, node):
+        """Walk from node up to the root, maintaining node heights and sizes.
+
+        Once a height does not change, no height above it can change either, so only sizes are left to fix.
+
+        :param node: The lowest node whose subtree changed.
+        """
+        while node:
+            old_height = node.height
+            self.update_node(node)
+            if node.height == old_height:
+                self._update_sizes(node.parent)
+                break
+            node = node.parent
+
+    def _update_sizes(self, node):
+        """Recompute subtree sizes from node up to the root."""
+        while node:
+            self.set_node_size(node)
+            node = node.parent
 
     def delete(self, value):
         """Delete value from BST.
@@ -107,54 +205,36 @@ class BST:
         :param value: The value to delete from the BST.
         :return:      If exists, return value. Otherwise, return None.
         """
-        return self._delete_helper(self.root, value)
-
-    def _delete_helper(self, curr_node, value):
-        """Perform binary search on BST and delete node with value.
-
-        :param curr_node: Current node in BST while traversing.
-        :param value:     The value to delete from the BST.
-        :return:          If exists, return value. Otherwise, return None.
-        """
-        if not curr_node:
+        node = self.search(value)
+        if not node:
             return None  # Node with value does not exist.
 
-        if curr_node.data != value:
-            # Have not found node to delete. Continue traversing.
-            result = None
-
-            if value <= curr_node.data:
-                result = self._delete_helper(curr_node.left,  value)
-            else:
-                result = self._delete_helper(curr_node.right, value)
-
-            # Maintain node height.
-            self.set_node_height(curr_node)
-
-            return result
+        if node.count > 1:
+            # Multiset: just uncount it.
+            node.count -= 1
+            self.size -= 1
+            self._update_sizes(node)
+        elif node.left and node.right:
+            self._delete_helper_children_and(node)
         else:
-            # Delete curr_node.
-            if curr_node.left and curr_node.right:
-                self._delete_helper_children_and(curr_node)
-            else:
-                child = self._get_single_child(curr_node)
-                self._delete_helper_children_nand(curr_node, child)
-
-            # Maintain node height.
-            self.set_node_height(curr_node)
+            child = self._get_single_child(node)
+            self._delete_helper_children_nand(node, child)
 
-            return value  # Because we found value to be deleted.
+        return value  # Because we found value to be deleted.
 
     def _delete_helper_children_and(self, node):
         """Delete node, which has two children... Like an AND gate :)
 
-        Find and delete predecessor. Set node's value to its predecessor's value.
+        Set node's value to its predecessor's value, then splice out the predecessor node itself
+        (max of the left subtree, so it has no right child). No second search from the root,
+        which could also find a different node when there are duplicates.
 
         :param node: The node to be deleted.
         """
-        predecessor = self.get_predecessor(node)
-        self._delete_helper(self.root, predecessor.data)  # Delete the predecessor.
+        predecessor = self._get_max(node.left)
         node.data = predecessor.data
+        node.count = predecessor.count
+        self._delete_helper_children_nand(predecessor, predecessor.left)  # Retraces once, from its parent.
 
     def _delete_helper_children_nand(self, node, child):
         """Delete node, which has zero or one child... Like a NAND gate :)
@@ -162,18 +242,30 @@ class BST:
         :param node:  The node to be deleted.
         :param child: The single child of node, or None if node has no children.
         """
-        self.size -= 1
-        if node == self.root:  # Oh man, special cases.
+        self.size -= 1  # node holds the one key being deleted, or is a predecessor standing in for it.
+        parent = node.parent
+        if node is self.root:  # Oh man, special cases.
             self.root = child
-        elif node.data <= node.parent.data:
+        elif parent.left is node:
             # node is left child of node.parent
-            node.parent.left = child
+            parent.left = child
         else:
             # node is right child of node.parent
-            node.parent.right = child
+            parent.right = child
 
         if child:
-            child.parent = node.parent
+            child.parent = parent
+
+        self._deleted(node, child, parent)
+
+    def _deleted(self, node, child, parent):
+        """Called after node was spliced out (child took its place under parent). Retrace from parent.
+
+        :param node:   The node that was removed.
+        :param child:  The single child of node (now a child of parent), or None.
+        :param parent: Parent of node (None if node was the root).
+        """
+        self._retrace(parent)
 
     def _get_single_child(self, node):
         """Get single child. Assume node has < 2 children.
@@ -189,52 +281,106 @@ class BST:
             return None
 
     def get_predecessor(self, node):
-        """Get Predecessor.
+        """Get Predecessor (the node before node 'in order').
+
+        Max of the left subtree if there is one. Otherwise, the first ancestor node is right of.
 
         :param node: Node to find the predecessor of.
         :return:     If exists, the predecessor of node. Otherwise, return None.
         """
-        if not node or not node.left:
+        if not node:
             return None
-        else:
+        if node.left:
             return self._get_max(node.left)
+        while node.parent and node.parent.left is node:
+            node = node.parent
+        return node.parent
+
+    def get_successor(self, node):
+        """Get Successor (the node after node 'in order').
+
+        Min of the right subtree if there is one. Otherwise, the first ancestor node is left of.
+
+        :param node: Node to find the successor of.
+        :return:     If exists, the successor of node. Otherwise, return None.
+        """
+        if not node:
+            return None
+        if node.right:
+            return self._get_min(node.right)
+        while node.parent and node.parent.right is node:
+            node = node.parent
+        return node.parent
 
     def _get_max(self, node):
         """Get Max of subtree rooted at node.
 
         Go right!
 
-        :param node: Current node while finding the max.
+        :param node: Root of the subtree.
         :return:     The maximum node in this subtree.
         """
-        if not node.right:
-            return node
-        else:
-            return self._get_max(node.right)
+        while node.right:
+            node = node.right
+        return node
 
-    def in_order(self):
-        """In order traversal of BST (starting at root).
+    def _get_min(self, node):
+        """Get Min of subtree rooted at node.
 
-        :return: List of elements visited 'in order'.
-        """
-        integers = []
-        self._in_order_helper(self.root, integers)
-        return integers
-
-    def _in_order_helper(self, node, integers):
-        """In order traversal of BST.
+        Go left!
 
-        :param node:     Current node during traversal.
-        :param integers: List of elements visited so far.
+        :param node: Root of the subtree.
+        :return:     The minimum node in this subtree.
         """
-        if node:
+        while node.left:
+            node = node.left
+        return node
+
+    def min(self):
+        """Return the smallest key, or None if the tree is empty."""
+        return self._get_min(self.root).data if self.root else None
+
+    def max(self):
+        """Return the largest key, or None if the tree is empty."""
+        return self._get_max(self.root).data if self.root else None
+
+    def iter_pre_order(self):
+        """Lazy pre order traversal (node, left, right). Explicit stack, O(h) extra memory."""
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            yield from repeat(node.data, node.count)
+            if node.right:
+                stack.append(node.right)
             if node.left:
-                self._in_order_helper(node.left, integers)
-
-            integers.append(node.data)
-
+                stack.append(node.left)
+
+    def iter_post_order(self):
+        """Lazy post order traversal (left, right, node). Explicit stack, O(h) extra memory."""
+        stack = []
+        node = self.root
+        last_visited = None
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            top = stack[-1]
+            if top.right and top.right is not last_visited:
+                node = top.right  # Visit right subtree first.
+            else:
+                last_visited = stack.pop()
+                yield from repeat(last_visited.data, last_visited.count)
+
+    def iter_level_order(self):
+        """Lazy level order traversal (breadth first). Queue holds at most one level (O(width) memory)."""
+        queue = deque([self.root] if self.root else [])
+        while queue:
+            node = queue.popleft()
+            yield from repeat(node.data, node.count)
+            if node.left:
+                queue.append(node.left)
             if node.right:
-                self._in_order_helper(node.right, integers)
+                queue.append(node.right)
 
     def height(self):
         """Return height of BST."""
@@ -247,6 +393,22 @@ class BST:
         else:
             return -1
 
+    def node_size(self, node):
+        """Return number of keys in the subtree rooted at node."""
+        if node:
+            return node.size
+        else:
+            return 0
+
+    def set_node_size(self, node):
+        """Set node size to left size + right size + node count. Runs in O(1) time."""
+        node.size = self.node_size(node.left) + self.node_size(node.right) + node.count
+
+    def update_node(self, node):
+        """Maintain node height and size (from its children). Runs in O(1) time."""
+        self.set_node_height(node)
+        self.set_node_size(node)
+
     def set_node_height(self, node):
         """Set node height to max(left height, right height) + 1.
 
@@ -256,33 +418,69 @@ class BST:
         """
         node.height = max(self.node_height(node.left), self.node_height(node.right)) + 1
 
-    def pretty_print(self):
-        """Pretty print BST."""
-        if self.height() == -1:
-            print("Tree is empty.")
-            return
+    def left_rotate(self, node):
+        """Left rotate. Keeps the in order sequence, maintains node heights and sizes.
 
-        this_level = [self.root]
-        height = self.height()
-        spaces = get_spaces_array(height)
-        num_keys = 1
-
-        while height >= 0:
-            next_level = []
-            print(" " * spaces[height], end='')
-            for n in this_level:
-                num_spaces = " " * spaces[height+1]
-                print(str(n.data) + num_spaces, end='')
-                if n.left:
-                    next_level.append(n.left)
-                else:
-                    next_level.append(Node('x'))
-                if n.right:
-                    next_level.append(n.right)
-                else:
-                    next_level.append(Node('x'))
-            print()
-            print_slashes(height, spaces, num_keys)
-            height -= 1
-            num_keys *= 2
-            this_level = next_level
+        :param node: The node to rotate left.
+        """
+        node_x = node
+        node_y = node.right
+
+        if not node_y:
+            raise Exception("Cannot rotate left.")
+
+        # Maintain pointers.
+        if node_x.parent is None:
+            if node_x is self.root:  # Otherwise node_x is the root of a detached subtree.
+                self.root = node_y
+        elif node_x.parent.left is node_x:
+            node_x.parent.left = node_y
+        else:
+            node_x.parent.right = node_y
+
+        node_y.parent = node_x.parent
+        node_x.parent = node_y
+        node_x.right = node_y.left
+        if node_x.right:
+            node_x.right.parent = node_x
+        node_y.left = node_x
+
+        # Maintain node heights and sizes.
+        self.update_node(node_x)
+        self.update_node(node_y)
+
+    def right_rotate(self, node):
+        """Right rotate. Keeps the in order sequence, maintains node heights and sizes.
+
+        :param node: The node to rotate right.
+        """
+        node_x = node
+        node_y = node.left
+
+        if not node_y:
+            raise Exception("Cannot rotate right.")
+
+        # Maintain pointers.
+        if node_x.parent is None:
+            if node_x is self.root:  # Otherwise node_x is the root of a detached subtree.
+                self.root = node_y
+        elif node_x.parent.left is node_x:
+            node_x.parent.left = node_y
+        else:
+            node_x.parent.right = node_y
+
+        node_y.parent = node_x.parent
+        node_x.parent = node_y
+        node_x.left = node_y.right
+        if node_x.left:
+            node_x.left.parent = node_x
+        node_y.right = node_x
+
+        # Maintain node heights and sizes.
+        self.update_node(node_x)
+        self.update_node(node_y)
+
+
+def _is_sorted(integers):
+    """Return True if integers (a sequence) is sorted (ascending). O(n)."""
+    return all(a <= b for a, b in zip(integers, islice(integers, 1, None)))
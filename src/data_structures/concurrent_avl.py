@@ -0,0 +1,151 @@
+import threading
+
+from src.data_structures.persistent_avl import PersistentAVL
+
+
+class ConcurrentAVL:
+    """An AVL tree that many threads can read while one thread at a time writes. Same read API as PersistentAVL.
+
+    Holds the current version of a PersistentAVL and replaces it on every write: a write builds the
+    next version (copying only the O(lg(n)) nodes on its path) and then swaps it in with a single
+    assignment. Reads never lock: each one grabs the current version once and asks it, so a range scan,
+    traversal or count_range sees a consistent tree even while writes land.
+
+    That is the key based part of BST's read API (search, navigation, range, order statistics and the
+    in order traversals). get_predecessor and get_successor are not there (they walk parent pointers,
+    which persistent nodes do not have), and neither are the pre, post and level order traversals.
+
+    Writers are serialized by a lock. This holds on free threaded CPython builds too, because
+    reading or assigning an attribute is atomic there as well.
+
+    Attributes:
+        _version (PersistentAVL): The current version. Only ever replaced, never changed.
+        _lock             (Lock): Held by writers.
+    """
+
+    def __init__(self, integers, multiset=False):
+        """Initialize concurrent AVL tree.
+
+        :param integers: A list (of distinct integers) to make an AVL tree.
+        :param multiset: Count duplicates in a single node.
+        """
+        self._lock = threading.Lock()
+        self._version = PersistentAVL(integers, multiset)
+
+    def snapshot(self):
+        """Return the current version (a PersistentAVL). O(1): nothing is copied, and later writes do not change it."""
+        return self._version
+
+    @property
+    def multiset(self):
+        """Count duplicates in a single node (see BST)."""
+        return self._version.multiset
+
+    @property
+    def size(self):
+        """Size of tree (number of keys, counting duplicates)."""
+        return self._version.size
+
+    def bulk_load(self, integers):
+        """Insert many integers at once: merge them with the current keys and build a balanced tree. O(n lg(n))."""
+        with self._lock:
+            self._version = self._version.bulk_load(integers)
+
+    def insert(self, value):
+        """Insert value. Runs in O(lg(n)) time, allocating O(lg(n)) nodes.
+
+        :param value: The value to insert.
+        """
+        with self._lock:
+            self._version = self._version.insert(value)
+
+    def delete(self, value):
+        """Delete (one copy of) value.
+
+        :param value: The value to delete.
+        :return:      If exists, return value. Otherwise, return None.
+        """
+        with self._lock:
+            version = self._version.delete(value)
+            if version is self._version:
+                return None
+            self._version = version
+            return value
+
+    # Reads: each one asks a single version (see PersistentAVL).
+
+    def search(self, value):
+        """Return value if it is in the current version, otherwise None."""
+        return self._version.search(value)
+
+    def __contains__(self, value):
+        """Return True if value is in the current version."""
+        return value in self._version
+
+    def min(self):
+        """Return the smallest key of the current version, or None if it is empty."""
+        return self._version.min()
+
+    def max(self):
+        """Return the largest key of the current version, or None if it is empty."""
+        return self._version.max()
+
+    def floor(self, value):
+        """Return the largest key <= value in the current version, or None."""
+        return self._version.floor(value)
+
+    def ceiling(self, value):
+        """Return the smallest key >= value in the current version, or None."""
+        return self._version.ceiling(value)
+
+    def predecessor(self, value):
+        """Return the largest key < value in the current version, or None."""
+        return self._version.predecessor(value)
+
+    def successor(self, value):
+        """Return the smallest key > value in the current version, or None."""
+        return self._version.successor(value)
+
+    def range(self, lo, hi):
+        """Lazily yield every key x with lo <= x <= hi, all from the version current at the call."""
+        return self._version.range(lo, hi)
+
+    def in_order(self):
+        """Return all keys of the current version in ascending order (a new list)."""
+        return self._version.in_order()
+
+    def __iter__(self):
+        """Iterate over the version current at the call, in order. Later writes do not show up."""
+        return iter(self._version)
+
+    def iter_in_order(self):
+        """Lazy in order traversal of the version current at the call (ascending)."""
+        return self._version.iter_in_order()
+
+    def iter_reverse_order(self):
+        """Lazy reverse in order traversal of the version current at the call (descending)."""
+        return self._version.iter_reverse_order()
+
+    def height(self):
+        """Return the height of the current version."""
+        return self._version.height()
+
+    def rank(self, value):
+        """Return the number of keys < value in the current version."""
+        return self._version.rank(value)
+
+    def select(self, k):
+        """Return the k-th smallest key of the current version, or None if k is out of range."""
+        return self._version.select(k)
+
+    def count_range(self, lo, hi):
+        """Return the number of keys x with lo <= x <= hi. Both ranks come from the same version."""
+        return self._version.count_range(lo, hi)
+
+    def percentile(self, p):
+        """Return the p-th percentile key (see BST.percentile). Size and select come from the same version."""
+        return self._version.percentile(p)
+
+    def pretty_print(self, max_depth=None, outline=False):
+        """Pretty print the current version (see BST.pretty_print)."""
+        self._version.pretty_print(max_depth, outline)
@@ -0,0 +1,166 @@
+class IndexedMaxHeap:
+    """A max heap (of integers) whose keys can be updated and removed by handle.
+
+    insert() returns a handle. The handle stays valid until its key is removed, no matter
+    how the key moves around the heap, because a position map tracks where every handle lives.
+
+    Attributes:
+        _keys    (list): The max heap (keys).
+        _handles (list): Handle of the key at the same index of _keys.
+        _index   (dict): Handle -> index of its key in _keys.
+        _next_handle (int): Handle given to the next inserted key.
+    """
+
+    def __init__(self, integers=()):
+        """Initialize indexed max heap.
+
+        Handles of the initial integers are 0, 1, 2, ... in iteration order.
+
+        :param integers: an iterable (of integers) to make a max heap.
+        """
+        self._keys = list(integers)
+        self._handles = list(range(len(self._keys)))
+        self._index = {handle: handle for handle in self._handles}
+        self._next_handle = len(self._keys)
+
+        size = len(self._keys)
+        for index in range((size >> 1) - 1, -1, -1):
+            self._sift_down(index)
+
+    def __contains__(self, handle):
+        """Return True if handle refers to a key in the heap. Runs in O(1) time."""
+        return handle in self._index
+
+    def size(self):
+        """Return size of max heap."""
+        return len(self._keys)
+
+    def get_key(self, handle):
+        """Return the key of handle. Raises KeyError if handle is not in the heap."""
+        return self._keys[self._index[handle]]
+
+    def max(self):
+        """Return max key.
+
+         If size of heap is 0, then return -1.
+         """
+        return self._keys[0] if self._keys else -1
+
+    def max_handle(self):
+        """Return handle of max key.
+
+         If size of heap is 0, then return None.
+         """
+        return self._handles[0] if self._handles else None
+
+    def insert(self, key):
+        """Insert key into max heap. Runs in O(lg(n)) time.
+
+        :return: The handle of key.
+        """
+        handle = self._next_handle
+        self._next_handle += 1
+
+        self._index[handle] = len(self._keys)
+        self._keys.append(key)
+        self._handles.append(handle)
+        self._sift_up(len(self._keys) - 1)
+        return handle
+
+    def extract_max(self):
+        """Remove and return max key.
+
+        If size of heap is 0, then returns -1.
+        """
+        item = self.pop_item()
+        return item[1] if item else -1
+
+    def pop_item(self):
+        """Remove max key and return (handle, key).
+
+        If size of heap is 0, then returns None.
+        """
+        if not self._keys:
+            return None
+        handle = self._handles[0]
+        return handle, self.remove(handle)
+
+    def update(self, handle, key):
+        """Change the key of handle (up or down). Runs in O(lg(n)) time.
+
+        :param handle: Handle returned by insert.
+        :param key:    The new key.
+        """
+        index = self._index[handle]
+        old_key = self._keys[index]
+        self._keys[index] = key
+        if old_key < key:
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+
+    def remove(self, handle):
+        """Remove handle from the heap. Runs in O(lg(n)) time.
+
+        Move the last key into the hole, then sift it whichever way it needs to go.
+
+        :param handle: Handle returned by insert.
+        :return:       The key of handle.
+        """
+        index = self._index.pop(handle)
+        key = self._keys[index]
+
+        last_key = self._keys.pop()
+        last_handle = self._handles.pop()
+        if index < len(self._keys):
+            self._keys[index] = last_key
+            self._handles[index] = last_handle
+            self._index[last_handle] = index
+            if key < last_key:
+                self._sift_up(index)
+            else:
+                self._sift_down(index)
+        return key
+
+    def _sift_down(self, index):
+        """Move the key at index down until neither child is larger (see MaxHeap._sift_down).
+
+        :param index: The index to sift down from.
+        """
+        keys, handles, positions = self._keys, self._handles, self._index
+        size = len(keys)
+        key, handle = keys[index], handles[index]
+        child = (index << 1) + 1
+        while child < size:
+            right = child + 1
+            if right < size and not keys[child] > keys[right]:
+                child = right
+            if not key < keys[child]:
+                break
+            keys[index] = keys[child]
+            handles[index] = handles[child]
+            positions[handles[index]] = index
+            index = child
+            child = (index << 1) + 1
+        keys[index] = key
+        handles[index] = handle
+        positions[handle] = index
+
+    def _sift_up(self, index):
+        """Move the key at index up until its parent is not smaller (see MaxHeap._sift_up).
+
+        :param index: The index to sift up from.
+        """
+        keys, handles, positions = self._keys, self._handles, self._index
+        key, handle = keys[index], handles[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if not keys[parent] < key:
+                break
+            keys[index] = keys[parent]
+            handles[index] = handles[parent]
+            positions[handles[index]] = index
+            index = parent
+        keys[index] = key
+        handles[index] = handle
+        positions[handle] = index
@@ -1,42 +1,161 @@
-from math import log, ceil, floor
+from array import array
+from itertools import islice
 
-from src.util.pretty_print import get_spaces_array, print_slashes
+from src.data_structures.snapshot import HEAP_MAGIC, read_snapshot, write_snapshot
+from src.util.pretty_print import dary_max_depth, print_tree, render_dary_tree
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional. Without it, everything runs in pure Python.
+    numpy = None
+
+VECTORIZE_MIN_SIZE = 1024  # Below this, NumPy call overhead outweighs the pure Python loop.
 
 
 class MaxHeap:
     """A max heap (of non-negative integers) with all the fixings.
 
+    The keys live in a list, or in a packed array('q') (8 bytes per key instead of a boxed int).
+    Either way, the heap is built in place on whatever is passed in.
+
+    If NumPy is installed, large packed binary heaps are built and sorted with vectorized NumPy
+    operations on a zero-copy view of the array('q'). A NumPy array passed in is always stored packed.
+
+    The heap is binary by default. A d-ary heap (every node has up to d children) is shallower,
+    so inserts touch fewer levels, at the cost of more comparisons per level when sifting down.
+
     Attributes:
-        _heap (list): The max heap.
+        _heap (list or array): The max heap.
+        arity          (int): Max number of children per node.
     """
 
-    def __init__(self, integers):
+    def __init__(self, integers, compact=False, arity=2):
         """Initialize max heap.
 
-        :param integers: a list (of integers) to make a max heap.
+        :param integers: a list (of integers) to make a max heap. An array('q') is used as is (no copy).
+        :param compact:  If True, store the keys in an array('q'). See compact_array().
+        :param arity:    Max number of children per node (>= 2).
         """
-        self._heap = integers
+        if arity < 2:
+            raise ValueError("Arity must be at least 2.")
+        if numpy is not None and isinstance(integers, numpy.ndarray):
+            compact = True
+        self.arity = arity
+        self._heap = compact_array(integers) if compact else integers
         self.build_max_heap()
 
+    @classmethod
+    def load(cls, path, writable=False):
+        """Load a max heap saved with save(). The heap is used as is (it is not rebuilt).
+
+        By default the keys are memory mapped (read-only): max, size, pretty_print and reading
+        _heap work straight away, with nothing parsed. Anything that changes the heap needs writable.
+
+        :param path:     Snapshot file.
+        :param writable: If True, copy the keys into an array('q') (one memcpy) so the heap can change.
+        """
+        arity, _, keys = read_snapshot(path, HEAP_MAGIC, writable)  # keys holds exactly size keys.
+        heap = cls.__new__(cls)
+        heap.arity = arity
+        heap._heap = keys
+        return heap
+
+    def save(self, path):
+        """Save max heap to path (the heap array as 64 bit integers, see snapshot). Load with load()."""
+        write_snapshot(path, HEAP_MAGIC, self.arity, self.size(), self._heap)
+
+    def is_compact(self):
+        """Return True if the keys are stored in an array('q')."""
+        return isinstance(self._heap, array)
+
+    def _vectorize(self):
+        """Return True if the heap should take the vectorized NumPy path."""
+        return numpy is not None and self.size() >= VECTORIZE_MIN_SIZE and self.is_compact() and self.arity == 2
+
     def build_max_heap(self):
         """Build max heap."""
-        for index in range(int(self.size() / 2), -1, -1):
-            self.max_heapify(index)
+        if self._vectorize():
+            _build_max_heap_vectorized(numpy.frombuffer(self._heap, dtype=numpy.int64))
+            return
+
+        size = self.size()
+        for index in range(self.parent_of(size - 1), -1, -1):
+            self._sift_down(index, size)
 
-    def max_heapify(self, index):
+    def max_heapify(self, index, size=None):
         """Makes subtree (rooted at index) a max heap.
 
         ASSERT: left and right subtrees (of index) are max heaps.
 
         :param index: The index to make a max heap.
+        :param size:  Only consider the first size keys (defaults to the whole heap).
         """
-        violation = self.violation(index)
-        if violation == 1:
-            self.swap(index, self.left(index))
-            self.max_heapify(self.left(index))
-        elif violation == 2:
-            self.swap(index, self.right(index))
-            self.max_heapify(self.right(index))
+        self._sift_down(index, self.size() if size is None else size)
+
+    def _sift_down(self, index, size):
+        """Move the key at index down until neither child is larger. Iterative.
+
+        Children are moved up into the 'hole' and the key is written once at the end,
+        so each level costs one write instead of a swap.
+
+        :param index: The index to sift down from.
+        :param size:  Only consider the first size keys.
+        :return:      The index the key ended up at.
+        """
+        if self.arity != 2:
+            return self._sift_down_dary(index, size)
+
+        heap = self._heap
+        key = heap[index]
+        child = (index << 1) + 1
+        while child < size:
+            right = child + 1
+            if right < size and not heap[child] > heap[right]:
+                child = right  # right child is max (ties go right)
+            if not key < heap[child]:
+                break  # no violation
+            heap[index] = heap[child]
+            index = child
+            child = (index << 1) + 1
+        heap[index] = key
+        return index
+
+    def _sift_down_dary(self, index, size):
+        """Same as _sift_down, for any arity. Ties go to the rightmost child."""
+        heap = self._heap
+        arity = self.arity
+        key = heap[index]
+        child = arity * index + 1
+        while child < size:
+            end = min(child + arity, size)
+            for sibling in range(child + 1, end):
+                if not heap[child] > heap[sibling]:
+                    child = sibling
+            if not key < heap[child]:
+                break
+            heap[index] = heap[child]
+            index = child
+            child = arity * index + 1
+        heap[index] = key
+        return index
+
+    def _sift_up(self, index):
+        """Move the key at index up until its parent is not smaller. Iterative.
+
+        :param index: The index to sift up from.
+        :return:      The index the key ended up at.
+        """
+        heap = self._heap
+        arity = self.arity
+        key = heap[index]
+        while index > 0:
+            parent = (index - 1) >> 1 if arity == 2 else (index - 1) // arity
+            if not heap[parent] < key:
+                break
+            heap[index] = heap[parent]
+            index = parent
+        heap[index] = key
+        return index
 
     def swap(self, i1, i2):
         """Swap keys at index i1 and i2."""
@@ -44,29 +163,29 @@ class MaxHeap:
         self._heap[i1] = self._heap[i2]
         self._heap[i2] = temp
 
-    def violation(self, index):
+    def violation(self, index, size=None):
         """Determines if key at index violates max heap invariant.
 
         :param index: index of heap to check for violation.
+        :param size:  Only consider the first size keys (defaults to the whole heap).
         :return: 0 if no violation.
                  1 if violation and left  child is the max.
                  2 if violation and right child is the max.
+                 k + 1 if violation and child k is the max (d-ary heaps).
         """
-        left = self.left(index)
-        right = self.right(index)
-        left_vio = left < self.size() and self._heap[index] < self._heap[left]
-        right_vio = right < self.size() and self._heap[index] < self._heap[right]
-
-        if left_vio != right_vio:  # xor
-            if left_vio:
-                return 1
-            else:
-                return 2
-        elif left_vio and right_vio:
-            if self._heap[self.left(index)] > self._heap[self.right(index)]:
-                return 1  # left child is max
-            else:
-                return 2  # right child is max
+        if size is None:
+            size = self.size()
+        first = self.child(index, 0)
+        children = range(first, min(first + self.arity, size))
+        if not children:
+            return 0  # no children, no violation
+
+        max_child = children[0]
+        for child in children[1:]:
+            if not self._heap[max_child] > self._heap[child]:
+                max_child = child  # ties go right
+        if self._heap[index] < self._heap[max_child]:
+            return max_child - first + 1
         else:
             return 0  # no violation
 
@@ -82,11 +201,15 @@ class MaxHeap:
 
         If size of heap is 0, then returns -1.
         """
-        max_key = self.max()
-        if max_key != -1:
-            self.swap(0, self.size() - 1)
-            self._heap = self._heap[:-1]
-            self.max_heapify(0)
+        heap = self._heap
+        if not heap:
+            return -1
+        last = heap.pop()  # Shrink in place. Slicing would copy the whole heap.
+        if not heap:
+            return last
+        max_key = heap[0]
+        heap[0] = last
+        self._sift_down(0, len(heap))
         return max_key
 
     def size(self):
@@ -97,8 +220,14 @@ class MaxHeap:
         """Return height of max heap.
 
         Heaps are always 'balanced' so we can get the height of the tree from the size.
+        Count full levels (1, d, d^2, ... keys) until they hold every key. O(lg(n)).
         """
-        return ceil(log(self.size() + 1, 2)) - 1  # O(lg(n)) but have to account for off-by-one error.
+        height, level_size, total = -1, 1, 0
+        while total < self.size():
+            total += level_size
+            level_size *= self.arity
+            height += 1
+        return height
 
     def increase_key(self, index, new_key):
         """Increase the key at index to new_key.
@@ -108,57 +237,230 @@ class MaxHeap:
         """
         if self._heap[index] < new_key:  # check if we're increasing the key at index.
             self._heap[index] = new_key
-            while index > 0 and self._heap[MaxHeap.parent(index)] < self._heap[index]:
-                self.swap(index, MaxHeap.parent(index))
-                index = MaxHeap.parent(index)
+            self._sift_up(index)
 
     def insert(self, key):
         """Insert value into max heap."""
-        self._heap.append(-1)
-        self.increase_key(self.size() - 1, key)
+        self._heap.append(key)
+        self._sift_up(len(self._heap) - 1)
+
+    def push_many(self, integers):
+        """Insert many keys into max heap.
+
+        The keys are appended in one go. Sifting each one up costs O(lg(n)) per key,
+        rebuilding costs O(n) in total, so pick whichever is cheaper.
+
+        :param integers: The keys to insert.
+        """
+        heap = self._heap
+        start = len(heap)
+        heap.extend(integers)
+        size = len(heap)
+        if (size - start) * size.bit_length() > size:
+            self.build_max_heap()
+        else:
+            for index in range(start, size):
+                self._sift_up(index)
+
+    def pushpop(self, key):
+        """Insert key, then remove and return max key. Faster than insert followed by extract_max.
+
+        If key is at least the max, the heap is not touched and key is returned.
+        """
+        heap = self._heap
+        if heap and key < heap[0]:
+            key, heap[0] = heap[0], key
+            self._sift_down(0, len(heap))
+        return key
+
+    def replace(self, key):
+        """Remove and return max key, then insert key. Faster than extract_max followed by insert.
+
+        If size of heap is 0, then key is inserted and -1 is returned.
+        """
+        heap = self._heap
+        if not heap:
+            heap.append(key)
+            return -1
+        max_key = heap[0]
+        heap[0] = key
+        self._sift_down(0, len(heap))
+        return max_key
+
+    def merge(self, other):
+        """Merge the keys of another max heap into this one. Runs in O(n + m) time.
+
+        :param other: The max heap to merge in (left unchanged).
+        """
+        self._heap.extend(other._heap)
+        self.build_max_heap()
+
+    def heapsort(self):
+        """Sort the backing array in place (descending). Runs in O(n lg(n)) time.
+
+        Repeatedly swap the max to the end of the heap and max heapify what is left.
+        No new list is allocated. A descending list is still a max heap, so the heap stays valid.
+
+        :return: The backing array, sorted (descending).
+        """
+        if self._vectorize():
+            keys = numpy.frombuffer(self._heap, dtype=numpy.int64)
+            keys.sort(kind='heapsort')
+            keys[:] = keys[::-1]
+            return self._heap
+
+        heap = self._heap
+        for end in range(len(heap) - 1, 0, -1):
+            heap[0], heap[end] = heap[end], heap[0]
+            self._sift_down(0, end)
+        self._heap.reverse()
+        return self._heap
 
     def sorted_array(self):
-        """Return sorted list. Empties heap."""
-        sorted_list = []
-        for i in range(self.size()):
-            sorted_list.append(self.extract_max())
+        """Return sorted list (descending). Empties heap.
+
+        The backing array is sorted in place (see heapsort) and handed over to the caller.
+        """
+        sorted_list = self.heapsort()
+        self._heap = sorted_list[:0]  # Empty, same storage type.
         return sorted_list
 
+    def child(self, index, k):
+        """Return index of the k-th child (0 <= k < arity)."""
+        return self.arity * index + 1 + k
+
+    def parent_of(self, index):
+        """Return index of parent (respects arity)."""
+        return (index - 1) // self.arity
+
     @staticmethod
     def left(index):
-        """Return index of left child."""
+        """Return index of left child (binary heap)."""
         return 2 * index + 1
 
     @staticmethod
     def right(index):
-        """Return index of right child."""
+        """Return index of right child (binary heap)."""
         return 2 * index + 2
 
     @staticmethod
     def parent(index):
-        """Return index of parent."""
-        return floor((index - 1) / 2)
+        """Return index of parent (binary heap)."""
+        return (index - 1) >> 1
+
+    def pretty_print(self, max_depth=None, outline=False):
+        """Pretty print max heap (one write).
 
-    def pretty_print(self):
-        """Pretty print max heap."""
+        :param max_depth: Deepest level to print (the root is level 0). See print_tree for the default
+                          (dary_max_depth for a d-ary heap, so the layout stays as wide as a binary one).
+        :param outline:   Print an indented outline (one line per key) instead, for heaps too large to draw.
+        """
         if self.size() == 0:
             print("Max heap is empty.")
             return
 
-        height = self.height()
-        spaces = get_spaces_array(height)
-        num_keys = 1
-        index = 0
-
-        for h in range(height, -1, -1):
-            print(" " * spaces[h], end="")
-            for i in range(num_keys):
-                if index >= self.size():
-                    break  # Break if we've printed all keys.
-                num_spaces = " " * spaces[h + 1]
-                print(str(self._heap[index]) + num_spaces, end="")
-                index += 1
-
-            print()
-            print_slashes(h, spaces, num_keys)
-            num_keys *= 2  # The number of keys doubles each level.
+        size = self.size()
+        heap = self._heap
+
+        def children(index):
+            first = self.child(index, 0)
+            return list(range(first, min(first + self.arity, size)))
+
+        def label(index):
+            return str(heap[index])
+
+        if outline:
+            print_tree(0, children, label, max_depth, outline, placeholder=None)
+        elif self.arity == 2:
+            print_tree(0, lambda index: (children(index) + [None, None])[:2], label, max_depth, placeholder=None)
+        else:
+            if max_depth is None:
+                max_depth = dary_max_depth(self.arity)
+            levels, start, level_size = [], 0, 1
+            while start < size and len(levels) <= max_depth:
+                levels.append(heap[start:start + level_size])
+                start += level_size
+                level_size *= self.arity
+            lines = render_dary_tree(levels, self.arity)
+            if start < size:
+                lines.append("(levels below {} not shown)".format(max_depth))
+            print("\n".join(lines))
+
+
+def _build_max_heap_vectorized(keys):
+    """Build max heap in place on a NumPy array, one tree level at a time.
+
+    Nodes at the same depth have disjoint subtrees, so every node on a level can be sifted down
+    at once: each step compares all of them with their children and swaps where needed.
+    Produces the same heap as build_max_heap (ties go right).
+
+    :param keys: 1-D NumPy array.
+    """
+    size = len(keys)
+    if size < 2:
+        return
+
+    last_parent = (size >> 1) - 1
+    for depth in range((last_parent + 1).bit_length() - 1, -1, -1):
+        first = (1 << depth) - 1
+        nodes = numpy.arange(first, min(2 * first + 1, last_parent + 1))
+        while nodes.size:
+            left = (nodes << 1) + 1
+            in_heap = left < size
+            nodes, left = nodes[in_heap], left[in_heap]
+            right = left + 1
+            has_right = right < size
+            right_keys = keys[numpy.where(has_right, right, left)]
+            child = numpy.where(has_right & ~(keys[left] > right_keys), right, left)
+
+            violation = keys[nodes] < keys[child]
+            nodes, child = nodes[violation], child[violation]
+            keys[nodes], keys[child] = keys[child], keys[nodes]
+            nodes = child
+
+
+def compact_array(integers):
+    """Return integers as an array('q') (signed 64 bit, 8 bytes per key).
+
+    An array('q') is returned as is. Anything exposing a contiguous buffer of 8 byte integers
+    (e.g. a NumPy int64 array) is copied with a single memcpy. Anything else is converted key by key.
+
+    :param integers: Iterable of integers.
+    :return:         The array('q').
+    """
+    if isinstance(integers, array) and integers.typecode == 'q':
+        return integers
+
+    try:
+        view = memoryview(integers)
+    except TypeError:
+        return array('q', integers)
+
+    with view:
+        if view.itemsize == 8 and view.format.lstrip('@=<') in ('q', 'l') and view.c_contiguous:
+            packed = array('q')
+            packed.frombytes(view.cast('B'))
+            return packed
+    return array('q', integers)
+
+
+def top_k(integers, k, heap_class=MaxHeap):
+    """Return the k largest integers (descending). Runs in O(n lg(k)) time and O(k) memory.
+
+    Keeps a max heap of the k largest keys seen so far, negated, so the root is the smallest of them.
+    Every other key either replaces the root (pushpop) or is dropped.
+
+    :param integers:   Any iterable of integers (it is only read once, so a stream works).
+    :param k:          Number of keys to keep.
+    :param heap_class: MaxHeap or a subclass (e.g. an instrumented one, see util.stats).
+    :return:         List of the k largest integers (descending).
+    """
+    if k <= 0:
+        return []
+
+    iterator = iter(integers)
+    heap = heap_class([-i for i in islice(iterator, k)])
+    pushpop = heap.pushpop
+    for i in iterator:
+        pushpop(-i)
+    return [-i for i in reversed(heap.sorted_array())]
@@ -0,0 +1,27 @@
+from math import ceil
+
+
+class OrderStatistics:
+    """count_range and percentile, for any sorted container.
+
+    Subclasses provide size, rank(value) (number of keys < value), _rank_less_equal(value)
+    (number of keys <= value) and select(k) (the k-th smallest key, or None).
+    """
+
+    def count_range(self, lo, hi):
+        """Return the number of keys x with lo <= x <= hi. Two rank queries."""
+        if hi < lo:
+            return 0
+        return self._rank_less_equal(hi) - self.rank(lo)
+
+    def percentile(self, p):
+        """Return the p-th percentile key (nearest rank). One select.
+
+        E.g. percentile(99) is the smallest key that is >= 99% of all keys.
+
+        :param p: Percentile, 0 <= p <= 100.
+        :return:  The key, or None if there are no keys.
+        """
+        if not 0 <= p <= 100:
+            raise ValueError("Percentile must be between 0 and 100.")
+        return self.select(max(ceil(p * self.size / 100) - 1, 0))
@@ -0,0 +1,214 @@
+from itertools import groupby
+
+from src.data_structures.tree_reads import TreeReads
+
+
+class PersistentNode:
+    """Immutable AVL node. Never changed after __init__, so it can be shared by any number of versions.
+
+    Same fields as bst.Node, minus parent (a shared node has one parent per version).
+    """
+
+    __slots__ = ('data', 'count', 'left', 'right', 'height', 'size')
+
+    def __init__(self, data, count, left, right):
+        self.data = data
+        self.count = count
+        self.left = left
+        self.right = right
+        self.height = max(_height(left), _height(right)) + 1
+        self.size = _size(left) + _size(right) + count
+
+
+def _height(node):
+    return node.height if node else -1
+
+
+def _size(node):
+    return node.size if node else 0
+
+
+class PersistentAVL(TreeReads):
+    """A persistent AVL tree: insert and delete return a new version, and every old version stays valid.
+
+    A new version copies only the O(lg(n)) nodes on the path to the change (and the nodes a rotation
+    moves), and shares every other node with the version it came from (path copying). Keeping a
+    version around is free, so a snapshot is just a reference to it.
+
+    Same key based read API as BST (both get it from TreeReads), without BST's node based calls.
+
+    left <= node <= right. insert sends a duplicate left, but bulk loads and rotations can leave equal
+    keys on either side, which search, rank and range allow for. With multiset, duplicates share a node.
+
+    Attributes:
+        root       (PersistentNode): Root of this version (None if empty). Never changed.
+        multiset             (bool): Count duplicates in a single node (see BST).
+        node_class           (type): Class of the nodes (see BST).
+    """
+
+    node_class = PersistentNode
+
+    def __init__(self, integers, multiset=False):
+        """Initialize persistent AVL tree.
+
+        :param integers: A list (of distinct integers) to make an AVL tree.
+        :param multiset: Count duplicates in a single node.
+        """
+        self.root = None
+        self.multiset = multiset
+        self.root = self._load(integers)
+
+    @classmethod
+    def _version(cls, root, multiset):
+        """Return a version with the given root (no copying)."""
+        tree = cls.__new__(cls)
+        tree.root = root
+        tree.multiset = multiset
+        return tree
+
+    @property
+    def size(self):
+        """Size of tree (number of keys, counting duplicates)."""
+        return _size(self.root)
+
+    def bulk_load(self, integers):
+        """Return a new version with many integers inserted at once, built balanced. O(n lg(n)).
+
+        Does not share nodes with this version.
+        """
+        return self._version(self._load(integers), self.multiset)
+
+    def _load(self, integers):
+        """Return the root of a balanced tree holding the keys of this version and integers."""
+        keys = sorted(list(self.iter_in_order()) + list(integers))
+        counts = None
+        if self.multiset:
+            runs = [(key, len(list(run))) for key, run in groupby(keys)]
+            keys = [key for key, _ in runs]
+            counts = [count for _, count in runs]
+        return self._build(keys, counts, 0, len(keys))
+
+    def _build(self, keys, counts, lo, hi):
+        """Build a perfectly balanced tree from sorted keys[lo:hi] (see BST._build_balanced)."""
+        if lo >= hi:
+            return None
+        mid = (lo + hi) >> 1
+        return self.node_class(keys[mid], counts[mid] if counts else 1,
+                               self._build(keys, counts, lo, mid), self._build(keys, counts, mid + 1, hi))
+
+    def insert(self, value):
+        """Return a new version with value inserted. Runs in O(lg(n)) time, allocating O(lg(n)) nodes.
+
+        :param value: The value to insert.
+        :return:      The new version (this one is left as is).
+        """
+        return self._version(self._insert(self.root, value), self.multiset)
+
+    def _insert(self, node, value):
+        if node is None:
+            return self.node_class(value, 1, None, None)
+        if self.multiset and value == node.data:
+            return self.node_class(node.data, node.count + 1, node.left, node.right)
+        if value <= node.data:
+            return self._balance_node(node.data, node.count, self._insert(node.left, value), node.right)
+        return self._balance_node(node.data, node.count, node.left, self._insert(node.right, value))
+
+    def delete(self, value):
+        """Return a new version with (one copy of) value deleted. Runs in O(lg(n)) time, allocating O(lg(n)) nodes.
+
+        :param value: The value to delete.
+        :return:      The new version, or this version if value does not exist.
+        """
+        root, found = self._delete(self.root, value)
+        return self._version(root, self.multiset) if found else self
+
+    def _delete(self, node, value):
+        """Return (subtree without value, True), or (node, False) if value is not there."""
+        if node is None:
+            return None, False
+        if value == node.data:
+            if node.count > 1:
+                return self.node_class(node.data, node.count - 1, node.left, node.right), True
+            if node.left is None:
+                return node.right, True
+            if node.right is None:
+                return node.left, True
+            left, predecessor = self._pop_max(node.left)
+            return self._balance_node(predecessor.data, predecessor.count, left, node.right), True
+
+        if value < node.data:
+            left, found = self._delete(node.left, value)
+            return (self._balance_node(node.data, node.count, left, node.right), True) if found else (node, False)
+        right, found = self._delete(node.right, value)
+        return (self._balance_node(node.data, node.count, node.left, right), True) if found else (node, False)
+
+    def _pop_max(self, node):
+        """Return (node's subtree without its max node, the max node)."""
+        if node.right is None:
+            return node.left, node
+        right, max_node = self._pop_max(node.right)
+        return self._balance_node(node.data, node.count, node.left, right), max_node
+
+    def _balance_node(self, data, count, left, right):
+        """Return a new node (data, count, left, right), rebalanced like AVL._balance_node."""
+        diff = _height(left) - _height(right)
+        if diff > 1:
+            if _height(left.left) < _height(left.right):
+                left = self.left_rotate(left)  # zigzag
+            return self.right_rotate(self.node_class(data, count, left, right))
+        if diff < -1:
+            if _height(right.right) < _height(right.left):
+                right = self.right_rotate(right)  # zagzig
+            return self.left_rotate(self.node_class(data, count, left, right))
+        return self.node_class(data, count, left, right)
+
+    def left_rotate(self, node):
+        """Left rotate a copy of node's subtree (see BST.left_rotate). node is left as is.
+
+        :param node: The node to rotate left.
+        :return:     The new root of the subtree.
+        """
+        right = node.right
+        return self.node_class(right.data, right.count,
+                               self.node_class(node.data, node.count, node.left, right.left), right.right)
+
+    def right_rotate(self, node):
+        """Right rotate a copy of node's subtree (see BST.right_rotate). node is left as is.
+
+        :param node: The node to rotate right.
+        :return:     The new root of the subtree.
+        """
+        left = node.left
+        return self.node_class(left.data, left.count,
+                               left.left, self.node_class(node.data, node.count, left.right, node.right))
+
+    def search(self, value):
+        """Search for value. Runs in O(lg(n)) time.
+
+        :return: If exists, return value. Otherwise, return None.
+        """
+        node = self.root
+        while node is not None and node.data != value:
+            node = node.left if value <= node.data else node.right
+        return None if node is None else value
+
+    def __contains__(self, value):
+        return self.search(value) is not None
+
+    def min(self):
+        """Return the smallest key, or None if the tree is empty."""
+        node = self.root
+        while node is not None and node.left is not None:
+            node = node.left
+        return node.data if node else None
+
+    def max(self):
+        """Return the largest key, or None if the tree is empty."""
+        node = self.root
+        while node is not None and node.right is not None:
+            node = node.right
+        return node.data if node else None
+
+    def height(self):
+        """Return height of tree."""
+        return _height(self.root)
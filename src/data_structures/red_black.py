@@ -0,0 +1,223 @@
+from src.data_structures.bst import BST, Node
+
+
+class RBNode(Node):
+    """Node in a red-black tree.
+
+    Attributes:
+        red (bool): Color of the node (False is black). New nodes are red.
+    """
+
+    __slots__ = ('red',)
+
+    def __init__(self, key, count=1):
+        Node.__init__(self, key, count)
+        self.red = True
+
+
+def is_red(node):
+    """Return True if node is red. Missing (None) nodes are black."""
+    return node is not None and node.red
+
+
+class RedBlack(BST):
+    """A red-black tree (subclass of BST). Same public API as BST and AVL.
+
+    Looser balance than AVL (height <= 2 lg(n + 1)), but at most 2 rotations per insert and
+    3 per delete, which makes it cheaper for write heavy loads.
+
+    Rep invariant:
+        The root is black.
+        A red node has no red children.
+        Every path from a node down to a missing child has the same number of black nodes.
+
+    Distinct integers. left <= node < right.
+
+    The colors do the balancing. Node heights and sizes are kept up to date on the walk to the
+    root that every insert and delete already makes for sizes (see _retrace), so height() is O(1).
+
+    Attributes:
+        root     (RBNode): Root of tree.
+        size        (int): Size of tree (number of keys, counting duplicates).
+        multiset   (bool): Count duplicates in a single node (see BST).
+    """
+
+    node_class = RBNode
+
+    def __init__(self, integers, multiset=False):
+        """Initialize red-black tree. Built in one go with bulk_load (see AVL).
+
+        :param integers: A list (of distinct integers) to make a red-black tree.
+        :param multiset: Count duplicates in a single node.
+        """
+        self.root = None
+        self.size = 0
+        self.multiset = multiset
+        self.bulk_load(integers)
+
+    def bulk_load(self, integers):
+        """Insert many integers at once by building a perfectly balanced tree (see BST.bulk_load).
+
+        Every leaf is on the last or second to last level. Color the last level red if it is not full,
+        and everything else black, so every path has the same number of black nodes.
+        """
+        BST.bulk_load(self, integers)
+        if not self.root:
+            return
+
+        levels = self._levels()
+        last_depth = len(levels) - 1
+        for level in levels:
+            for node in level:
+                node.red = False
+        if len(levels[last_depth]) < 2 ** last_depth:
+            for node in levels[last_depth]:
+                node.red = True
+        self.root.red = False
+
+    def _levels(self):
+        """Return the nodes of the tree, one list per level (root first)."""
+        levels = []
+        level = [self.root] if self.root else []
+        while level:
+            levels.append(level)
+            level = [child for node in level for child in (node.left, node.right) if child]
+        return levels
+
+    def _retrace(self, node):
+        """Walk from node up to the root, recomputing heights and sizes.
+
+        Runs once the colors are fixed, so the rotations in between (which only fix the two nodes
+        they move) never need a walk of their own. No early stop: a rotation higher up can change
+        heights above a node whose own height did not change. Inlined, as it runs on every insert and delete.
+
+        :param node: The lowest node whose subtree changed.
+        """
+        while node:
+            left, right = node.left, node.right
+            if left:
+                if right:
+                    node.height = (left.height if left.height > right.height else right.height) + 1
+                    node.size = left.size + right.size + node.count
+                else:
+                    node.height = left.height + 1
+                    node.size = left.size + node.count
+            elif right:
+                node.height = right.height + 1
+                node.size = right.size + node.count
+            else:
+                node.height = 0
+                node.size = node.count
+            node = node.parent
+
+    def _inserted(self, node):
+        """Restore the rep invariant after node (red) was attached, then fix heights and sizes.
+
+        :param node: The new node.
+        """
+        leaf = node
+        while is_red(node.parent):
+            parent = node.parent
+            grandparent = parent.parent  # Exists, because a red node is never the root.
+            if parent is grandparent.left:
+                uncle = grandparent.right
+                if is_red(uncle):
+                    # Recolor and move the violation up.
+                    parent.red = uncle.red = False
+                    grandparent.red = True
+                    node = grandparent
+                else:
+                    if node is parent.right:
+                        node = parent
+                        self.left_rotate(node)
+                        parent = node.parent
+                    parent.red = False
+                    grandparent.red = True
+                    self.right_rotate(grandparent)
+            else:
+                uncle = grandparent.left
+                if is_red(uncle):
+                    parent.red = uncle.red = False
+                    grandparent.red = True
+                    node = grandparent
+                else:
+                    if node is parent.left:
+                        node = parent
+                        self.right_rotate(node)
+                        parent = node.parent
+                    parent.red = False
+                    grandparent.red = True
+                    self.left_rotate(grandparent)
+
+        self.root.red = False
+        self._retrace(leaf.parent)
+
+    def _deleted(self, node, child, parent):
+        """Restore the rep invariant after node (zero or one child) was spliced out, then fix heights and sizes.
+
+        Removing a black node leaves its side one black short. A red child can absorb that by
+        turning black, otherwise fix it up from child's position.
+
+        :param node:   The node that was removed.
+        :param child:  The single child of node (now a child of parent), or None.
+        :param parent: Parent of node (None if node was the root).
+        """
+        if not node.red:
+            if is_red(child):
+                child.red = False
+            else:
+                self._delete_fixup(child, parent)
+        self._retrace(parent)
+
+    def _delete_fixup(self, node, parent):
+        """Push the missing black up (or fix it with rotations) after a black node was removed.
+
+        :param node:   Node that is one black short (may be None).
+        :param parent: Parent of node.
+        """
+        while node is not self.root and not is_red(node):
+            if node is parent.left:
+                sibling = parent.right
+                if is_red(sibling):
+                    sibling.red = False
+                    parent.red = True
+                    self.left_rotate(parent)
+                    sibling = parent.right
+                if not is_red(sibling.left) and not is_red(sibling.right):
+                    sibling.red = True
+                    node, parent = parent, parent.parent
+                else:
+                    if not is_red(sibling.right):
+                        sibling.left.red = False
+                        sibling.red = True
+                        self.right_rotate(sibling)
+                        sibling = parent.right
+                    sibling.red = parent.red
+                    parent.red = False
+                    sibling.right.red = False
+                    self.left_rotate(parent)
+                    node = self.root
+            else:
+                sibling = parent.left
+                if is_red(sibling):
+                    sibling.red = False
+                    parent.red = True
+                    self.right_rotate(parent)
+                    sibling = parent.left
+                if not is_red(sibling.left) and not is_red(sibling.right):
+                    sibling.red = True
+                    node, parent = parent, parent.parent
+                else:
+                    if not is_red(sibling.left):
+                        sibling.right.red = False
+                        sibling.red = True
+                        self.left_rotate(sibling)
+                        sibling = parent.left
+                    sibling.red = parent.red
+                    parent.red = False
+                    sibling.left.red = False
+                    self.right_rotate(parent)
+                    node = self.root
+
+        if node:
+            node.red = False
@@ -0,0 +1,260 @@
+"""Binary snapshots of max heaps and trees, loaded with mmap (no parsing, no rebuilding).
+
+File layout (little endian, every field 8 bytes so the keys stay 8 byte aligned):
+
+    magic (8 bytes) | a (int64) | b (int64) | int64 payload ...
+
+    Max heap: a = arity, b = size. The payload is the heap array, as is.
+    Tree:     a = number of distinct keys (n), b = 1 if multiset else 0.
+              The payload is the keys in order (the shape is implied: bulk_load builds the
+              same perfectly balanced tree from them). In multiset mode, keys are distinct and are
+              followed by n + 1 prefix counts (number of keys before each distinct key).
+"""
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import groupby, repeat
+
+from src.data_structures.order_statistics import OrderStatistics
+from src.data_structures.tree_reads import TreeReads
+from src.util.pretty_print import print_tree
+
+HEAP_MAGIC = b'DSSHEAP1'
+TREE_MAGIC = b'DSSTREE1'
+HEADER = struct.Struct('<8sqq')
+
+
+def write_snapshot(path, magic, a, b, *payloads):
+    """Write a header and int64 payloads to path.
+
+    :param payloads:    Iterables of integers (an array('q') is written with a single memcpy).
+    :raises ValueError: If an integer does not fit in 64 bits (nothing is written).
+    """
+    try:
+        payloads = [payload if isinstance(payload, array) and payload.typecode == 'q' else array('q', payload)
+                    for payload in payloads]
+    except OverflowError:
+        raise ValueError("Snapshots only hold 64 bit integers.")
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(magic, a, b))
+        for payload in payloads:
+            if sys.byteorder == 'big':
+                payload = array('q', payload)
+                payload.byteswap()
+            payload.tofile(file)
+
+
+def read_snapshot(path, magic, writable=False):
+    """Memory map a snapshot. Nothing is read until a key is touched.
+
+    :param writable:    If True, copy the keys into an array('q') (one memcpy) instead.
+    :return:            (a, b, keys), keys is a read-only memoryview of int64 (or the array).
+    :raises ValueError: If path is not a snapshot of this kind, or its payload does not match its header.
+    """
+    with open(path, 'rb') as file:
+        header = file.read(HEADER.size)
+        if len(header) < HEADER.size or header[:8] != magic:
+            raise ValueError("Not a {} snapshot: {}".format(magic.decode(), path))
+        _, a, b = HEADER.unpack(header)
+        expected = _payload_length(magic, a, b)
+        payload_size = file.seek(0, 2) - HEADER.size
+        if expected < 0 or payload_size != 8 * expected:
+            raise ValueError("Corrupt {} snapshot (expected {} bytes of keys, found {}): {}".format(
+                magic.decode(), 8 * expected, payload_size, path))
+        if payload_size == 0:
+            return a, b, array('q') if writable else memoryview(b'').cast('q')
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    payload = memoryview(buffer)[HEADER.size:]
+    if not (writable or sys.byteorder == 'big'):
+        return a, b, payload.cast('q')
+
+    keys = array('q')
+    keys.frombytes(payload)
+    if sys.byteorder == 'big':
+        keys.byteswap()
+    return a, b, keys
+
+
+def _payload_length(magic, a, b):
+    """Return the number of int64 the payload should hold, given the header (see the module docstring)."""
+    if magic == HEAP_MAGIC:
+        return b if a >= 2 else -1  # Arity is at least 2.
+    return a + (a + 1 if b else 0)
+
+
+def save_tree(path, tree):
+    """Write the keys of tree (BST, AVL, BlockList, ...) to path, in order.
+
+    :param tree: Any tree with iter_in_order() and a multiset attribute.
+    """
+    if not tree.multiset:
+        keys = list(tree.iter_in_order())
+        write_snapshot(path, TREE_MAGIC, len(keys), 0, keys)
+        return
+
+    keys, prefix = [], [0]
+    for key, run in groupby(tree.iter_in_order()):
+        keys.append(key)
+        prefix.append(prefix[-1] + sum(1 for _ in run))
+    write_snapshot(path, TREE_MAGIC, len(keys), 1, keys, prefix)
+
+
+class TreeSnapshot(OrderStatistics):
+    """A read-only tree, memory mapped from a snapshot (see save_tree).
+
+    Same read API as BST (search, navigation, range, order statistics, traversals). Every query is
+    a binary search over the mapped keys, so it starts answering straight away. thaw() builds
+    a real tree (in O(n), no sorting) when it has to change.
+
+    Attributes:
+        _keys   (memoryview): Keys in order (distinct in multiset mode).
+        _prefix (memoryview): Number of keys before each distinct key (multiset mode), else None.
+        size           (int): Number of keys (counting duplicates).
+        multiset      (bool): Whether the tree was in multiset mode.
+        tree_class    (type): Class thaw() builds.
+    """
+
+    def __init__(self, path, tree_class):
+        """Map the snapshot at path.
+
+        :param tree_class: Class thaw() builds (BST, AVL, RedBlack, BlockList, ...).
+        """
+        n, multiset, payload = read_snapshot(path, TREE_MAGIC)
+        self.multiset = bool(multiset)
+        self.tree_class = tree_class
+        self._keys = payload[:n]
+        self._prefix = payload[n:] if multiset else None
+        self.size = self._prefix[n] if multiset else n
+
+    def thaw(self):
+        """Return a tree_class tree with the same keys."""
+        tree = self.tree_class([], multiset=self.multiset)
+        tree.bulk_load(self.in_order())
+        return tree
+
+    def save(self, path):
+        """Save the keys to path (see save_tree)."""
+        save_tree(path, self)
+
+    def _before(self, i):
+        """Return the number of keys before the i-th distinct key."""
+        return self._prefix[i] if self._prefix is not None else i
+
+    def _iter_slice(self, i, j):
+        """Yield the keys from the i-th to the j-th distinct key (exclusive), counting duplicates."""
+        if self._prefix is None:
+            yield from self._keys[i:j]
+            return
+        keys, prefix = self._keys, self._prefix
+        for index in range(i, j):
+            yield from repeat(keys[index], prefix[index + 1] - prefix[index])
+
+    def search(self, value):
+        """Return value if it is in the tree, otherwise None. Runs in O(lg(n)) time."""
+        i = bisect_left(self._keys, value)
+        return value if i < len(self._keys) and self._keys[i] == value else None
+
+    def min(self):
+        """Return the smallest key, or None if the tree is empty."""
+        return self._keys[0] if self._keys else None
+
+    def max(self):
+        """Return the largest key, or None if the tree is empty."""
+        return self._keys[-1] if self._keys else None
+
+    def floor(self, value):
+        """Return the largest key <= value, or None if there is none."""
+        i = bisect_right(self._keys, value)
+        return self._keys[i - 1] if i else None
+
+    def ceiling(self, value):
+        """Return the smallest key >= value, or None if there is none."""
+        i = bisect_left(self._keys, value)
+        return self._keys[i] if i < len(self._keys) else None
+
+    def predecessor(self, value):
+        """Return the largest key < value, or None if there is none."""
+        i = bisect_left(self._keys, value)
+        return self._keys[i - 1] if i else None
+
+    def successor(self, value):
+        """Return the smallest key > value, or None if there is none."""
+        i = bisect_right(self._keys, value)
+        return self._keys[i] if i < len(self._keys) else None
+
+    def range(self, lo, hi):
+        """Lazily yield every key x with lo <= x <= hi (ascending)."""
+        return self._iter_slice(bisect_left(self._keys, lo), bisect_right(self._keys, hi))
+
+    def in_order(self):
+        """Return all keys in ascending order (a new list)."""
+        if self._prefix is None:
+            return self._keys.tolist()
+        return list(self.iter_in_order())
+
+    def __iter__(self):
+        """Iterate over keys in ascending order (lazily)."""
+        return self.iter_in_order()
+
+    def iter_in_order(self):
+        """Lazy in order traversal (ascending)."""
+        return self._iter_slice(0, len(self._keys))
+
+    def iter_reverse_order(self):
+        """Lazy reverse in order traversal (descending)."""
+        if self._prefix is None:
+            return iter(self._keys[::-1])
+        keys, prefix = self._keys, self._prefix
+        return (keys[i] for i in range(len(keys) - 1, -1, -1) for _ in range(prefix[i + 1] - prefix[i]))
+
+    def height(self):
+        """Return height of the tree bulk_load builds from these keys (-1 if empty)."""
+        return len(self._keys).bit_length() - 1
+
+    def rank(self, value):
+        """Return the number of keys < value. Runs in O(lg(n)) time."""
+        return self._before(bisect_left(self._keys, value))
+
+    def _rank_less_equal(self, value):
+        """Return the number of keys <= value. Runs in O(lg(n)) time."""
+        return self._before(bisect_right(self._keys, value))
+
+    def select(self, k):
+        """Return the k-th smallest key (k = 0 is the min).
+
+        :return: If 0 <= k < size, return the key. Otherwise, return None.
+        """
+        if not 0 <= k < self.size:
+            return None
+        if self._prefix is None:
+            return self._keys[k]
+        return self._keys[bisect_right(self._prefix, k) - 1]
+
+    def pretty_print(self, max_depth=None, outline=False):
+        """Pretty print the tree that thaw() would build, without building it. Same arguments as BST.pretty_print.
+
+        thaw() builds node trees middle key first (see BST.bulk_load), so the subtree holding the i-th
+        to j-th distinct keys has the middle one at its root. Each node is drawn from its (i, j) range,
+        and only the levels that get printed are visited. A BlockList is thawed (it prints every key anyway).
+        """
+        if not issubclass(self.tree_class, TreeReads):
+            self.thaw().pretty_print(max_depth, outline)
+            return
+        if not self._keys:
+            print("Tree is empty.")
+            return
+
+        def children(span):
+            lo, hi = span
+            mid = (lo + hi) >> 1
+            return (lo, mid) if lo < mid else None, (mid + 1, hi) if mid + 1 < hi else None
+
+        def label(span):
+            mid = (span[0] + span[1]) >> 1
+            count = self._before(mid + 1) - self._before(mid)
+            return str(self._keys[mid]) if count == 1 else "{}({})".format(self._keys[mid], count)
+
+        print_tree((0, len(self._keys)), children, label, max_depth, outline)
@@ -0,0 +1,198 @@
+from itertools import repeat
+
+from src.data_structures.order_statistics import OrderStatistics
+from src.util.pretty_print import print_tree
+
+
+class TreeReads(OrderStatistics):
+    """Read only queries on a binary search tree (left <= node <= right), shared by BST and PersistentAVL.
+
+    Subclasses provide root: the root node (or None), with data, count, size, left and right
+    (see bst.Node). Each query reads root once, and never changes a node.
+    """
+
+    def floor(self, value):
+        """Return the largest key <= value, or None if there is none. Runs in O(h) time."""
+        floor = None
+        node = self.root
+        while node:
+            if node.data == value:
+                return value
+            elif node.data < value:
+                floor = node.data
+                node = node.right
+            else:
+                node = node.left
+        return floor
+
+    def ceiling(self, value):
+        """Return the smallest key >= value, or None if there is none. Runs in O(h) time."""
+        ceiling = None
+        node = self.root
+        while node:
+            if node.data == value:
+                return value
+            elif node.data > value:
+                ceiling = node.data
+                node = node.left
+            else:
+                node = node.right
+        return ceiling
+
+    def predecessor(self, value):
+        """Return the largest key < value, or None if there is none. Runs in O(h) time.
+
+        value does not have to be in the tree.
+        """
+        predecessor = None
+        node = self.root
+        while node:
+            if node.data < value:
+                predecessor = node.data
+                node = node.right
+            else:
+                node = node.left
+        return predecessor
+
+    def successor(self, value):
+        """Return the smallest key > value, or None if there is none. Runs in O(h) time.
+
+        value does not have to be in the tree.
+        """
+        successor = None
+        node = self.root
+        while node:
+            if node.data > value:
+                successor = node.data
+                node = node.left
+            else:
+                node = node.right
+        return successor
+
+    def range(self, lo, hi):
+        """Lazily yield every key x with lo <= x <= hi (ascending). Runs in O(h + k) time for k keys.
+
+        Seed the in order stack with the search path for lo (only the nodes >= lo), then run
+        the usual in order traversal until a key passes hi.
+        """
+        stack = []
+        node = self.root
+        while node:
+            if lo <= node.data:
+                stack.append(node)
+                node = node.left
+            else:
+                node = node.right
+
+        while stack:
+            node = stack.pop()
+            if node.data > hi:
+                return
+            yield from repeat(node.data, node.count)
+            node = node.right
+            while node:
+                stack.append(node)
+                node = node.left
+
+    def in_order(self):
+        """In order traversal of the tree (starting at root).
+
+        :return: List of elements visited 'in order'.
+        """
+        return list(self.iter_in_order())
+
+    def __iter__(self):
+        """Iterate over elements 'in order' (lazily)."""
+        return self.iter_in_order()
+
+    def iter_in_order(self):
+        """Lazy in order traversal (ascending). Explicit stack, O(h) extra memory.
+
+        The tree must not be modified while iterating.
+        """
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield from repeat(node.data, node.count)
+            node = node.right
+
+    def iter_reverse_order(self):
+        """Lazy reverse in order traversal (descending). Explicit stack, O(h) extra memory."""
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.right
+            node = stack.pop()
+            yield from repeat(node.data, node.count)
+            node = node.left
+
+    def rank(self, value):
+        """Return the number of keys < value. Runs in O(h) time (subtree sizes)."""
+        rank = 0
+        node = self.root
+        while node:
+            if value <= node.data:
+                node = node.left
+            else:
+                rank += _size(node.left) + node.count
+                node = node.right
+        return rank
+
+    def _rank_less_equal(self, value):
+        """Return the number of keys <= value. Runs in O(h) time."""
+        rank = 0
+        node = self.root
+        while node:
+            if value < node.data:
+                node = node.left
+            else:
+                rank += _size(node.left) + node.count
+                node = node.right
+        return rank
+
+    def select(self, k):
+        """Return the k-th smallest key (k = 0 is the min). Runs in O(h) time (subtree sizes).
+
+        :param k: Rank of the key to return.
+        :return:  If 0 <= k < size, return the key. Otherwise, return None.
+        """
+        node = self.root
+        if not 0 <= k < _size(node):
+            return None
+
+        while True:
+            left_size = _size(node.left)
+            if k < left_size:
+                node = node.left
+            elif k < left_size + node.count:
+                return node.data
+            else:
+                k -= left_size + node.count
+                node = node.right
+
+    def pretty_print(self, max_depth=None, outline=False):
+        """Pretty print the tree (one write). Missing children show as 'x', a duplicate count as 'key(count)'.
+
+        :param max_depth: Deepest level to print (the root is level 0). See print_tree for the default.
+        :param outline:   Print an indented outline (one line per key) instead, for trees too tall to draw.
+        """
+        root = self.root
+        if root is None:
+            print("Tree is empty.")
+            return
+        print_tree(root, lambda node: (node.left, node.right), self._label, max_depth, outline)
+
+    @staticmethod
+    def _label(node):
+        """Return the text of node for pretty_print."""
+        return str(node.data) if node.count == 1 else "{}({})".format(node.data, node.count)
+
+
+def _size(node):
+    return node.size if node else 0
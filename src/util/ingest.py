@@ -0,0 +1,135 @@
+"""Read integers from a file in fixed size chunks, parsed in bulk into array('q') (64 bit) chunks.
+
+Two input formats:
+    text   -- Integers separated by whitespace (newlines, spaces, ...). A token is an optional
+              sign followed by digits. Integers that do not fit in 64 bits are allowed: the chunk
+              they are in comes back as a list of Python ints instead.
+    binary -- Raw little endian 64 bit integers (8 bytes each, no separators).
+
+Text is parsed with NumPy (one C call per chunk) if it is installed, otherwise with int() per token.
+Both accept exactly the same tokens. Files must be opened in binary mode ('rb').
+"""
+import re
+import sys
+import warnings
+from array import array
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional. Without it, text is parsed in pure Python.
+    numpy = None
+
+INPUT_FORMATS = ('text', 'binary')
+CHUNK_SIZE = 1 << 20  # Bytes read per chunk (a multiple of 8).
+INT64_MIN, INT64_MAX = -(1 << 63), (1 << 63) - 1
+LONE_SIGN = re.compile(rb'[+-](?![0-9])')  # A sign not followed by a digit (b'-', b'+ 1', b'--1').
+
+
+def read_chunks(file, input_format='text', chunk_size=CHUNK_SIZE):
+    """Yield the integers in file as array('q') chunks (see parse_text for text). Memory use is O(chunk_size).
+
+    :param file:         File opened in binary mode.
+    :param input_format: 'text' or 'binary'.
+    :param chunk_size:   Bytes read at a time.
+    :raises ValueError:  If the input is not integers (or not whole 8 byte integers).
+    """
+    if input_format == 'binary':
+        return _read_binary_chunks(file, chunk_size)
+    elif input_format == 'text':
+        return _read_text_chunks(file, chunk_size)
+    raise ValueError("Unknown input format: {}".format(input_format))
+
+
+def read_integers(file, input_format='text', chunk_size=CHUNK_SIZE):
+    """Return all the integers in file as one array('q'), or a list if one does not fit in 64 bits (see read_chunks)."""
+    integers = array('q')
+    for chunk in read_chunks(file, input_format, chunk_size):
+        if isinstance(integers, array) and not isinstance(chunk, array):
+            integers = integers.tolist()
+        integers.extend(chunk)
+    return integers
+
+
+def parse_text(data):
+    """Parse whitespace separated integers (bytes).
+
+    :return:            An array('q'), or a list of ints if one does not fit in 64 bits.
+    :raises ValueError: If a token is not an optional sign followed by digits.
+    """
+    # NumPy reads a lone sign as part of the next number (or as 0), and int() allows underscores.
+    if b'_' in data or _has_lone_sign(data):
+        raise ValueError("Only integers are allowed.")
+    if numpy is None or not data.strip():  # NumPy parses blank input as [0].
+        return _parse_text_python(data)
+
+    with warnings.catch_warnings():
+        # Older NumPy only warns (and stops) on a bad token.
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            parsed = numpy.fromstring(data, dtype=numpy.int64, sep=' ')
+        except (ValueError, DeprecationWarning):
+            raise ValueError("Only integers are allowed.")
+
+    if parsed.size and (parsed.max() == INT64_MAX or parsed.min() == INT64_MIN):
+        return _parse_text_python(data)  # NumPy clips out of range integers. Let int() decide.
+    integers = array('q')
+    integers.frombytes(memoryview(parsed).cast('B'))
+    return integers
+
+
+def _has_lone_sign(data):
+    """Return True if a + or - in data is not followed by a digit (vectorized with NumPy, if installed)."""
+    if numpy is None:
+        return LONE_SIGN.search(data) is not None
+    buffer = numpy.frombuffer(data, dtype=numpy.uint8)
+    after = numpy.flatnonzero((buffer == ord('+')) | (buffer == ord('-'))) + 1
+    if after.size and after[-1] == buffer.size:
+        return True  # A sign at the very end.
+    return bool((buffer[after] - ord('0') > 9).any())  # uint8: anything below '0' wraps around.
+
+
+def _parse_text_python(data):
+    """Same as parse_text, one int() call per token (after parse_text's checks)."""
+    try:
+        integers = list(map(int, data.split()))
+    except ValueError:
+        raise ValueError("Only integers are allowed.")
+    try:
+        return array('q', integers)
+    except OverflowError:
+        return integers  # Does not fit in 64 bits.
+
+
+def _read_text_chunks(file, chunk_size):
+    """Yield parsed chunks. A token cut in two at the end of a chunk is carried over to the next one."""
+    rest = b''
+    while True:
+        data = file.read(chunk_size)
+        if not data:
+            break
+        data = rest + data
+        cut = max(data.rfind(space) for space in (b' ', b'\n', b'\t', b'\r'))
+        data, rest = data[:cut + 1], data[cut + 1:]
+        if data:
+            yield parse_text(data)
+    if rest:
+        yield parse_text(rest)
+
+
+def _read_binary_chunks(file, chunk_size):
+    """Yield chunks of raw little endian 64 bit integers (memcpy, nothing to parse)."""
+    chunk_size -= chunk_size % 8
+    while True:
+        data = file.read(chunk_size)
+        if not data:
+            return
+        while len(data) % 8:
+            more = file.read(8 - len(data) % 8)  # Short read (e.g. a pipe).
+            if not more:
+                raise ValueError("Binary input must be a whole number of 8 byte integers.")
+            data += more
+        integers = array('q')
+        integers.frombytes(data)
+        if sys.byteorder == 'big':
+            integers.byteswap()
+        yield integers
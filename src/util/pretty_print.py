@@ -1,3 +1,7 @@
+from math import log2
+
+DEFAULT_MAX_DEPTH = 7  # Deeper levels make the tree layout thousands of characters wide. See render_outline.
+
 
 def get_spaces_array(height):
     """Return list for number of spaces per tree height (for pretty printing)."""
@@ -29,23 +33,184 @@ def _get_spaces_array_helper(n, memo):
             return next_val
 
 
-def print_slashes(h, spaces, num_keys):
-    """Print slashes (under tree at height h).
+def _slash_rows(h, spaces, slots, has_children):
+    """Return the rows of slashes under the keys at height h.
 
-    :param h: Height of tree to print slashes under.
-    :param spaces: Spaces array (get by calling get_spaces_array())
-    :param num_keys: The number of keys at height h of the tree.
+    :param slots:        Slots (positions in the level, ascending) of the keys that get slashes.
+    :param has_children: Function, slot -> (draw left slash, draw right slash).
     """
-    if h >= 1:
-        num_rows = spaces[h - 1]
-        num_spaces = spaces[h]
-        before = num_spaces - 1
-        after = 0
-        for row in range(num_rows):
-            for e in range(num_keys):
-                left = " " * before + "/" + " " * after
-                right = " " * after + "\\" + " " * before
-                print(left + " " + right + " ", end="")
-            print()
-            before -= 1
-            after += 1
+    if h < 1:
+        return []
+    num_spaces = spaces[h]
+    width = 2 * num_spaces + 2  # Width of the slashes under one key.
+    rows = []
+    for row in range(spaces[h - 1]):
+        before, after = num_spaces - 1 - row, row
+        pieces, cursor = [], 0
+        for slot in slots:
+            left, right = has_children(slot)
+            offset = slot * width + before
+            if left:
+                pieces.append(" " * (offset - cursor) + "/")
+                cursor = offset + 1
+            if right:
+                offset += 2 + 2 * after
+                pieces.append(" " * (offset - cursor) + "\\")
+                cursor = offset + 1
+        rows.append("".join(pieces))
+    return rows
+
+
+def print_tree(root, children, label, max_depth=None, outline=False, placeholder='x'):
+    """Pretty print a tree with a single write (see render_tree and render_outline).
+
+    :param max_depth: Deepest level to print (the root is level 0). None prints DEFAULT_MAX_DEPTH levels
+                      of the tree layout, or every level of an outline.
+    :param outline:   Print an indented outline (one line per node) instead of the tree layout.
+    """
+    if outline:
+        lines = render_outline(root, children, label, max_depth, placeholder)
+    else:
+        lines = render_tree(root, children, label, DEFAULT_MAX_DEPTH if max_depth is None else max_depth, placeholder)
+    print("\n".join(lines))
+
+
+def render_tree(root, children, label, max_depth=DEFAULT_MAX_DEPTH, placeholder='x'):
+    """Return the lines of a binary tree, drawn top down with slashes (the classic pretty_print layout).
+
+    Only the nodes that exist are visited, and every line is built with one join. The layout itself
+    doubles in width with every level, so only the first max_depth + 1 levels are drawn.
+
+    :param root:        Root node (any object, None if the tree is empty).
+    :param children:    Function, node -> (left, right). A missing child is None.
+    :param label:       Function, node -> str.
+    :param max_depth:   Deepest level to draw (the root is level 0). None draws every level.
+    :param placeholder: Drawn in place of a missing child (only next to a node that has a child). None draws nothing.
+    :return:            List of lines (no newlines).
+    """
+    levels = []  # Level by level: (slot, node) pairs, node is None for a placeholder.
+    level = [(0, root)] if root is not None else []
+    truncated = False
+    while level:
+        levels.append(level)
+        next_level = []
+        for slot, node in level:
+            if node is None:
+                continue
+            left, right = children(node)
+            if left is None and right is None:
+                continue
+            if left is not None or placeholder is not None:
+                next_level.append((2 * slot, left))
+            if right is not None or placeholder is not None:
+                next_level.append((2 * slot + 1, right))
+        if max_depth is not None and len(levels) > max_depth and next_level:
+            truncated = True
+            break
+        level = next_level
+
+    lines = []
+    height = len(levels) - 1
+    spaces = get_spaces_array(height)
+    for depth, level in enumerate(levels):
+        h = height - depth
+        lead, gap = spaces[h], spaces[h + 1]
+        pieces, cursor, extra = [], 0, 0  # extra: characters beyond 1 per key so far.
+        for slot, node in level:
+            text = placeholder if node is None else label(node)
+            position = lead + slot * (1 + gap) + extra
+            pieces.append(" " * (position - cursor) + text)
+            cursor = position + len(text)
+            extra += len(text) - 1
+        lines.append("".join(pieces))
+
+        if depth < height:
+            sides = {}  # Slot of a key -> (has left child, has right child).
+            for slot, _ in levels[depth + 1]:
+                left, right = sides.get(slot >> 1, (False, False))
+                sides[slot >> 1] = (True, right) if slot % 2 == 0 else (left, True)
+            lines.extend(_slash_rows(h, spaces, sorted(sides), sides.get))
+
+    if truncated:
+        lines.append("(levels below {} not shown)".format(max_depth))
+    return lines
+
+
+def render_outline(root, children, label, max_depth=None, placeholder='x'):
+    """Return the lines of a tree as an indented outline: one line per node, children below their parent.
+
+    Output is O(n) whatever the height of the tree, so it works for trees far too deep for render_tree.
+
+    :param children:    Function, node -> list of children (a missing child is None).
+    :param max_depth:   Deepest level to show (the root is level 0). None shows every level.
+    :param placeholder: Shown for a missing child (only next to a child that exists). None skips it.
+    :return:            List of lines (no newlines).
+    """
+    if root is None:
+        return []
+
+    lines = []
+    stack = [(root, "", "", 0)]  # Node, prefix of its line, prefix of its children's lines, depth.
+    while stack:
+        node, prefix, child_prefix, depth = stack.pop()
+        if node is None:
+            lines.append(prefix + placeholder)
+            continue
+        line = prefix + label(node)
+
+        kids = [child for child in children(node) if child is not None or placeholder is not None]
+        if all(child is None for child in kids):
+            lines.append(line)
+            continue
+        if max_depth is not None and depth >= max_depth:
+            lines.append(line + " ...")
+            continue
+        lines.append(line)
+        last = len(kids) - 1
+        for i in range(last, -1, -1):
+            if i == last:
+                stack.append((kids[i], child_prefix + "`-- ", child_prefix + "    ", depth + 1))
+            else:
+                stack.append((kids[i], child_prefix + "|-- ", child_prefix + "|   ", depth + 1))
+    return lines
+
+
+def dary_max_depth(arity):
+    """Return the default depth for render_dary_tree: about as wide as DEFAULT_MAX_DEPTH levels of a binary tree.
+
+    The layout is arity^depth slots wide, so keep arity^depth near 2^DEFAULT_MAX_DEPTH (at least one level).
+    """
+    return max(int(DEFAULT_MAX_DEPTH / log2(arity)), 1)
+
+
+def render_dary_tree(levels, arity):
+    """Return the lines of a complete d-ary tree (e.g. a d-ary heap).
+
+    Every key at height h gets a slot of (key width + 1) * arity^h characters and is centered in it.
+    A row of connectors ('/', '|' or '\\') goes under each level except the last.
+
+    :param levels: Keys of the tree, level by level (root first).
+    :param arity:  Max number of children per node.
+    """
+    height = len(levels) - 1
+    key_width = max(len(str(key)) for level in levels for key in level)
+    middle = (arity - 1) / 2
+
+    lines = []
+    for depth, level in enumerate(levels):
+        slot = (key_width + 1) * arity ** (height - depth)
+        lines.append("".join(str(key).center(slot) for key in level).rstrip())
+
+        if depth < height:
+            child_slot = slot // arity
+            connectors = []
+            for child in range(len(levels[depth + 1])):
+                position = child % arity
+                if position < middle:
+                    connectors.append("/".center(child_slot))
+                elif position > middle:
+                    connectors.append("\\".center(child_slot))
+                else:
+                    connectors.append("|".center(child_slot))
+            lines.append("".join(connectors).rstrip())
+    return lines
@@ -0,0 +1,222 @@
+"""Opt-in instrumentation for the data structures: operation counters, sift depths and timing histograms.
+
+Nothing here touches the real classes, so it costs nothing unless it is used. Stats.instrument(cls)
+returns a subclass whose hot methods are wrapped to record what they do, and Stats.key_type()
+returns an int subclass that counts every comparison made between keys.
+
+    stats = Stats()
+    Key = stats.key_type()
+    tree = stats.instrument(AVL)([Key(i) for i in integers])
+    print(stats.report())
+"""
+import time
+from collections import Counter
+from functools import wraps
+
+# Method name -> counter name. Only methods the class actually has are wrapped.
+COUNTED = {
+    'left_rotate': 'rotations.left',  # Single rotations: the two inside a zigzag/zagzig are not counted here.
+    'right_rotate': 'rotations.right',
+    '_new_node': 'allocations',  # ArrayAVL.
+}
+DOUBLE_ROTATIONS = {'zigzag': 'rotations.zigzag', 'zagzig': 'rotations.zagzig'}
+ROTATIONS = ('rotations.left', 'rotations.right') + tuple(DOUBLE_ROTATIONS.values())
+REBALANCE = '_balance_node'  # Counted as 'rebalances' only when it rotates (most calls find nothing to fix).
+SIFTS = ('_sift_down', '_sift_up')  # Return the index the key ended up at.
+TIMED = ('__init__', 'insert', 'delete', 'search', 'bulk_load', 'extract_max', 'pushpop', 'replace',
+         'push_many', 'merge', 'sorted_array', 'heapsort')
+
+
+class Histogram:
+    """Count, total, max and a bucketed distribution of the values added.
+
+    Attributes:
+        buckets (Counter): Bucket -> number of values in it.
+        bucket (function): Value -> bucket.
+    """
+
+    def __init__(self, bucket=int):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.buckets = Counter()
+        self.bucket = bucket
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.buckets[self.bucket(value)] += 1
+
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def quantile(self, q):
+        """Return the bucket the q-th quantile (0 <= q <= 1) falls in."""
+        target = q * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return bucket
+        return None
+
+
+def _log2_bucket(nanoseconds):
+    """Return the power of 2 (in ns) the duration is below."""
+    return 1 << int(nanoseconds).bit_length()
+
+
+def _depth(index, arity):
+    """Return the depth of index in a heap of the given arity."""
+    if arity == 2:
+        return (index + 1).bit_length() - 1
+    depth = 0
+    while index > 0:
+        index = (index - 1) // arity
+        depth += 1
+    return depth
+
+
+class Stats:
+    """Counters and histograms filled in by instrumented classes and counting keys.
+
+    Attributes:
+        counters   (Counter): Name -> count (comparisons, rotations.left, rebalances, allocations, ...).
+        histograms    (dict): Name -> Histogram (sift depths in levels, operation times in ns).
+    """
+
+    def __init__(self):
+        self.counters = Counter()
+        self.histograms = {}
+
+    def histogram(self, name, bucket=int):
+        """Return the histogram called name (created on first use)."""
+        if name not in self.histograms:
+            self.histograms[name] = Histogram(bucket)
+        return self.histograms[name]
+
+    def instrument(self, cls):
+        """Return a subclass of cls that records its work in these stats.
+
+        :param cls: BST, AVL, RedBlack, ArrayAVL, BlockList, MaxHeap, ...
+        """
+        namespace = {}
+        for name, counter in COUNTED.items():
+            if hasattr(cls, name):
+                namespace[name] = self._counted(getattr(cls, name), counter)
+        for name, counter in DOUBLE_ROTATIONS.items():
+            if hasattr(cls, name):
+                namespace[name] = self._double_rotation(getattr(cls, name), counter)
+        if hasattr(cls, REBALANCE):
+            namespace[REBALANCE] = self._rebalance(getattr(cls, REBALANCE))
+        for name in SIFTS:
+            if hasattr(cls, name):
+                namespace[name] = self._sift(getattr(cls, name), name.lstrip('_'))
+        for name in TIMED:
+            method = namespace.get(name) or getattr(cls, name, None)
+            if method:
+                namespace[name] = self._timed(method, 'build' if name == '__init__' else name)
+        if hasattr(cls, 'node_class'):
+            namespace['node_class'] = staticmethod(self._counted(cls.node_class, 'allocations'))
+        return type(cls.__name__, (cls,), namespace)
+
+    def key_type(self):
+        """Return an int subclass whose comparisons (<, <=, >, >=, ==, !=) are counted as 'comparisons'."""
+        counters = self.counters
+
+        def compare(operator):
+            method = getattr(int, operator)
+
+            def counted(a, b):
+                counters['comparisons'] += 1
+                return method(a, b)
+            return counted
+
+        namespace = {name: compare(name) for name in ('__lt__', '__le__', '__gt__', '__ge__', '__eq__', '__ne__')}
+        namespace['__hash__'] = int.__hash__  # Defining __eq__ would remove it.
+        namespace['__slots__'] = ()
+        return type('CountingKey', (int,), namespace)
+
+    def report(self):
+        """Return the stats as text (one line each)."""
+        lines = ["{:<24} {:>12}".format(name, count) for name, count in sorted(self.counters.items())]
+        for name, histogram in sorted(self.histograms.items()):
+            if not histogram.count:
+                continue
+            if name.startswith('time.'):
+                lines.append("{:<24} {:>12} calls  mean {:>10.0f} ns  p50 < {} ns  p99 < {} ns  max {} ns".format(
+                    name, histogram.count, histogram.mean(), histogram.quantile(0.5), histogram.quantile(0.99),
+                    histogram.max))
+            else:
+                lines.append("{:<24} {:>12} calls  mean {:>6.2f}  max {}  {}".format(
+                    name, histogram.count, histogram.mean(), histogram.max,
+                    " ".join("{}:{}".format(value, n) for value, n in sorted(histogram.buckets.items()))))
+        return "\n".join(lines)
+
+    def _counted(self, method, counter):
+        counters = self.counters
+
+        @wraps(method)
+        def counted(*args, **kwargs):
+            counters[counter] += 1
+            return method(*args, **kwargs)
+        return counted
+
+    def _double_rotation(self, method, counter):
+        """Wrap zigzag/zagzig: count it once, under counter, and not as the two single rotations it makes."""
+        counters = self.counters
+        singles = (COUNTED['left_rotate'], COUNTED['right_rotate'])
+
+        @wraps(method)
+        def double(*args, **kwargs):
+            before = [counters[name] for name in singles]
+            result = method(*args, **kwargs)
+            for name, count in zip(singles, before):
+                if count:
+                    counters[name] = count
+                else:
+                    counters.pop(name, None)
+            counters[counter] += 1
+            return result
+        return double
+
+    def _rebalance(self, method):
+        """Wrap _balance_node: count a 'rebalances' only if the call rotated something."""
+        counters = self.counters
+
+        @wraps(method)
+        def rebalance(*args, **kwargs):
+            before = sum(counters[name] for name in ROTATIONS)
+            result = method(*args, **kwargs)
+            if sum(counters[name] for name in ROTATIONS) != before:
+                counters['rebalances'] += 1
+            return result
+        return rebalance
+
+    def _sift(self, method, name):
+        """Wrap a sift method: record how many levels the key moved (a histogram of 'name.levels')."""
+        histogram = self.histogram(name + '.levels')
+
+        @wraps(method)
+        def sift(heap, index, *args):
+            end = method(heap, index, *args)
+            if end is not None:  # IndexedMaxHeap does not return it.
+                arity = getattr(heap, 'arity', 2)
+                histogram.add(abs(_depth(end, arity) - _depth(index, arity)))
+            return end
+        return sift
+
+    def _timed(self, method, name):
+        """Wrap a method: record its wall clock time (a histogram of 'time.name', ns, log2 buckets)."""
+        histogram = self.histogram('time.' + name, _log2_bucket)
+        clock = time.perf_counter_ns
+
+        @wraps(method)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                histogram.add(clock() - start)
+        return timed
@@ -0,0 +1,28 @@
+def assert_avl(tree):
+    """Check order, balance, heights, sizes and parent pointers of every node of an AVL tree.
+
+    Works for any tree with root and size (AVL, PersistentAVL). PersistentNodes have no parent pointers.
+
+    :return: The keys in order.
+    """
+    keys = _assert_avl_subtree(tree.root)
+    assert len(keys) == tree.size
+    return keys
+
+
+def _assert_avl_subtree(node):
+    if node is None:
+        return []
+    left, right = _assert_avl_subtree(node.left), _assert_avl_subtree(node.right)
+    for child in (node.left, node.right):
+        if child is not None and hasattr(child, 'parent'):
+            assert child.parent is node
+    assert abs(_height(node.left) - _height(node.right)) <= 1
+    assert node.height == max(_height(node.left), _height(node.right)) + 1
+    assert node.size == len(left) + len(right) + node.count
+    assert all(key <= node.data for key in left) and all(key >= node.data for key in right)
+    return left + [node.data] * node.count + right
+
+
+def _height(node):
+    return node.height if node else -1
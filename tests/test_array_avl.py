@@ -0,0 +1,36 @@
+from src.data_structures.array_avl import ArrayAVL
+from src.data_structures.avl import AVL
+
+
+def test_array_avl_height():
+    assert ArrayAVL([]).height() == -1
+    assert ArrayAVL([1]).height() == 0
+    assert ArrayAVL([1, 1, 1, 1]).height() == 2
+    assert ArrayAVL(range(1023)).height() == 9
+
+
+def test_array_avl_matches_avl():
+    keys = [(i * 37) % 1009 for i in range(1009)]
+    array_avl = ArrayAVL(keys)
+    avl = AVL([])
+    for key in keys:
+        avl.insert(key)  # Same insertion order, same shape.
+    assert array_avl.in_order() == avl.in_order()
+    assert array_avl.key(array_avl.search(500)) == 500
+    assert array_avl.search(5000) is None
+
+    for key in keys[::3]:
+        assert array_avl.delete(key) == key
+        avl.delete(key)
+        assert array_avl.height() == avl.height()
+    assert array_avl.delete(5000) is None
+    assert array_avl.in_order() == avl.in_order()
+    assert array_avl.size == avl.size
+
+
+def test_array_avl_reuses_ids():
+    array_avl = ArrayAVL([1, 2, 3])
+    array_avl.delete(2)
+    array_avl.insert(4)
+    assert len(array_avl._key) == 3
+    assert array_avl.in_order() == [1, 3, 4]
@@ -1,4 +1,7 @@
+import pytest
+
 from src.data_structures.avl import AVL
+from tests.helpers import assert_avl
 
 
 def test_avl_height():
@@ -16,3 +19,136 @@ def test_avl_height():
 
     avl = AVL([1, 1, 1, 1])
     assert avl.height() == 2
+
+
+def test_avl_sorted_input_is_balanced():
+    avl = AVL(range(1023))
+    assert avl.height() == 9
+    assert avl.in_order() == list(range(1023))
+    assert_avl(avl)
+
+
+def test_avl_delete_rebalances():
+    keys = [(i * 37) % 101 for i in range(101)]
+    avl = AVL(keys)
+    for key in keys[::2]:
+        assert avl.delete(key) == key
+        assert_avl(avl)
+    assert avl.delete(1000) is None
+    assert avl.in_order() == sorted(keys[1::2])
+
+
+def test_avl_bulk_load():
+    keys = [(i * 37) % 1000 for i in range(1000)]
+    for integers in [sorted(keys), keys, set(keys), iter(keys)]:
+        avl = AVL(integers)
+        assert avl.height() == 9  # Perfectly balanced.
+        assert avl.in_order() == sorted(keys)
+        assert_avl(avl)
+
+    avl = AVL([5, 1, 9])
+    avl.bulk_load([7, 3, 11])  # Merged with the existing keys.
+    assert avl.in_order() == [1, 3, 5, 7, 9, 11]
+    assert avl.root.parent is None
+    assert_avl(avl)
+
+
+def test_avl_order_statistics():
+    keys = [(i * 37) % 101 * 2 for i in range(101)]  # Even numbers 0..200.
+    avl = AVL([])
+    for key in keys:
+        avl.insert(key)
+    for key in keys[::4]:
+        avl.delete(key)
+    assert_avl(avl)
+    remaining = avl.in_order()
+
+    for k, key in enumerate(remaining):
+        assert avl.select(k) == key
+        assert avl.rank(key) == k
+        assert avl.rank(key + 1) == k + 1
+    assert avl.select(-1) is None
+    assert avl.select(len(remaining)) is None
+
+    assert avl.count_range(10, 50) == len([x for x in remaining if 10 <= x <= 50])
+    assert avl.count_range(11, 11) == 0
+    assert avl.count_range(50, 10) == 0
+
+    assert avl.percentile(0) == remaining[0]
+    assert avl.percentile(50) == remaining[len(remaining) // 2 - 1 + len(remaining) % 2]
+    assert avl.percentile(100) == remaining[-1]
+    assert AVL([]).percentile(99) is None
+
+
+def test_avl_split_and_join():
+    avl = AVL(range(100))
+    left, found, right = avl.split(40)
+    assert found
+    assert avl.size == 0
+    assert left.in_order() == list(range(40))
+    assert right.in_order() == list(range(41, 100))
+    assert_avl(left)
+    assert_avl(right)
+
+    joined = AVL.join(left, 40, right)
+    assert joined.in_order() == list(range(100))
+    assert_avl(joined)
+
+    left, found, right = AVL([1, 3]).split(2)
+    assert not found
+    with pytest.raises(ValueError):
+        AVL.join(right, 2, left)
+
+    for keys in ([1, 1, 1, 2, 3], [0, 1, 1, 1, 1, 1, 1, 2]):
+        left, found, right = AVL(keys).split(1)
+        assert found
+        assert (left.in_order(), right.in_order()) == ([k for k in keys if k < 1], [k for k in keys if k > 1])
+
+
+def test_avl_set_operations():
+    evens, threes = set(range(0, 300, 2)), set(range(0, 300, 3))
+
+    avl, other = AVL(evens), AVL(threes)
+    avl.union(other)
+    assert avl.in_order() == sorted(evens | threes)
+    assert other.size == 0  # Consumed.
+    assert_avl(avl)
+
+    avl = AVL(evens)
+    avl.intersection(AVL(threes))
+    assert avl.in_order() == sorted(evens & threes)
+    assert_avl(avl)
+
+    avl = AVL(evens)
+    avl.difference(AVL(threes))
+    assert avl.in_order() == sorted(evens - threes)
+    assert_avl(avl)
+
+
+def test_avl_duplicates_stress():
+    avl = AVL([])
+    counts = {}
+    for i in range(2000):
+        key = (i * 7919) % 13
+        if i % 3 == 2:
+            expected = key if counts.get(key) else None
+            assert avl.delete(key) == expected
+            if expected is not None:
+                counts[key] -= 1
+        else:
+            avl.insert(key)
+            counts[key] = counts.get(key, 0) + 1
+    assert_avl(avl)
+    assert avl.in_order() == sorted(k for k, c in counts.items() for _ in range(c))
+
+
+def test_avl_multiset():
+    avl = AVL([3, 1, 3, 2, 3, 1], multiset=True)
+    assert avl.height() == 1  # Three nodes.
+    assert avl.in_order() == [1, 1, 2, 3, 3, 3]
+    assert assert_avl(avl) == [1, 1, 2, 3, 3, 3]
+
+    avl.union(AVL([3, 4], multiset=True))
+    assert avl.in_order() == [1, 1, 2, 3, 3, 3, 3, 4]
+    avl.difference(AVL([1, 3, 3, 3], multiset=True))
+    assert avl.in_order() == [1, 2, 3, 4]
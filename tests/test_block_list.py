@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from src.data_structures import block_list
+from src.data_structures.block_list import BlockList
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    monkeypatch.setattr(block_list, 'BLOCK_SIZE', 4)
+
+
+def assert_block_list(blocks):
+    assert all(blocks._blocks)
+    assert blocks._maxes == [block[-1] for block in blocks._blocks]
+    assert all(len(block) <= 2 * block_list.BLOCK_SIZE for block in blocks._blocks)
+    assert blocks.in_order() == sorted(blocks.in_order())
+    assert len(blocks.in_order()) == blocks.size
+
+
+def test_block_list_insert_delete(small_blocks):
+    rng = random.Random(18)
+    blocks = BlockList([])
+    keys = []
+    for _ in range(2000):
+        key = rng.randrange(100)
+        if rng.random() < 0.6:
+            blocks.insert(key)
+            keys.append(key)
+        else:
+            assert blocks.delete(key) == (key if key in keys else None)
+            if key in keys:
+                keys.remove(key)
+    assert_block_list(blocks)
+    assert blocks.in_order() == sorted(keys)
+    assert list(blocks.iter_reverse_order()) == sorted(keys, reverse=True)
+    assert blocks.height() == 1
+
+
+def test_block_list_navigation(small_blocks):
+    blocks = BlockList(range(0, 100, 2))
+    assert_block_list(blocks)
+    assert blocks.search(40) == 40
+    assert blocks.search(41) is None
+    assert (blocks.min(), blocks.max()) == (0, 98)
+    assert (blocks.floor(41), blocks.floor(40), blocks.floor(-1)) == (40, 40, None)
+    assert (blocks.ceiling(41), blocks.ceiling(40), blocks.ceiling(99)) == (42, 40, None)
+    assert (blocks.predecessor(40), blocks.predecessor(0)) == (38, None)
+    assert (blocks.successor(40), blocks.successor(98)) == (42, None)
+    assert list(blocks.range(7, 21)) == [8, 10, 12, 14, 16, 18, 20]
+    assert list(blocks.range(90, 1000)) == [90, 92, 94, 96, 98]
+
+
+def test_block_list_order_statistics(small_blocks):
+    blocks = BlockList([5, 1, 5, 3, 9, 5, 7] * 3)
+    keys = sorted(blocks)
+    for k, key in enumerate(keys):
+        assert blocks.select(k) == key
+    assert blocks.select(len(keys)) is None
+    assert blocks.rank(5) == keys.index(5)
+    assert blocks.count_range(3, 5) == 12
+    blocks.delete(5)
+    assert blocks.count_range(3, 5) == 11
+    assert blocks.percentile(100) == 9
+    with pytest.raises(ValueError):
+        blocks.percentile(101)
@@ -16,3 +16,106 @@ def test_bst_height():
 
     bst = BST([1, 1, 1, 1])
     assert bst.height() == 3
+
+
+def test_bst_skewed_no_recursion_limit():
+    n = 1500  # Deeper than the default recursion limit.
+    bst = BST(range(n))
+    assert bst.height() == n - 1
+    assert bst.in_order() == list(range(n))
+    assert bst.search(n - 1).data == n - 1
+    assert bst.delete(n - 1) == n - 1
+    assert bst.height() == n - 2
+
+
+def test_bst_delete():
+    bst = BST([5, 3, 8, 1, 4, 7, 9])
+    assert bst.delete(6) is None
+    assert bst.delete(3) == 3  # Two children.
+    assert bst.delete(9) == 9  # Leaf.
+    assert bst.delete(8) == 8  # One child.
+    assert bst.delete(5) == 5  # Root.
+    assert bst.in_order() == [1, 4, 7]
+    assert bst.size == 3
+    assert bst.root.parent is None
+
+
+def test_bst_traversals():
+    #       4
+    #      / \
+    #     2   6
+    #    / \   \
+    #   1   3   7
+    bst = BST([4, 2, 6, 1, 3, 7])
+    assert list(bst) == [1, 2, 3, 4, 6, 7]
+    assert list(bst.iter_in_order()) == bst.in_order()
+    assert list(bst.iter_reverse_order()) == [7, 6, 4, 3, 2, 1]
+    assert list(bst.iter_pre_order()) == [4, 2, 1, 3, 6, 7]
+    assert list(bst.iter_post_order()) == [1, 3, 2, 7, 6, 4]
+    assert list(bst.iter_level_order()) == [4, 2, 6, 1, 3, 7]
+
+    empty = BST([])
+    assert list(empty) == []
+    assert list(empty.iter_post_order()) == []
+    assert list(empty.iter_level_order()) == []
+
+
+def test_bst_navigation():
+    bst = BST([40, 20, 60, 10, 30, 50, 70])
+    assert bst.min() == 10
+    assert bst.max() == 70
+    assert bst.floor(35) == 30
+    assert bst.floor(30) == 30
+    assert bst.floor(5) is None
+    assert bst.ceiling(35) == 40
+    assert bst.ceiling(40) == 40
+    assert bst.ceiling(75) is None
+    assert bst.predecessor(40) == 30
+    assert bst.predecessor(10) is None
+    assert bst.successor(40) == 50
+    assert bst.successor(45) == 50
+    assert bst.successor(70) is None
+
+    assert list(bst.range(15, 55)) == [20, 30, 40, 50]
+    assert list(bst.range(20, 20)) == [20]
+    assert list(bst.range(71, 80)) == []
+    assert list(bst.range(0, 100)) == bst.in_order()
+
+    leaf = bst.search(30)
+    assert bst.get_predecessor(leaf).data == 20
+    assert bst.get_successor(leaf).data == 40
+    assert bst.get_predecessor(bst.search(10)) is None
+    assert bst.get_successor(bst.search(70)) is None
+
+    empty = BST([])
+    assert empty.min() is None
+    assert empty.floor(1) is None
+    assert list(empty.range(0, 10)) == []
+
+
+def test_bst_delete_duplicates():
+    bst = BST([5, 5, 3, 5, 8, 5, 3])
+    for _ in range(4):
+        assert bst.delete(5) == 5
+    assert bst.delete(5) is None
+    assert bst.in_order() == [3, 3, 8]
+    assert bst.size == 3
+
+
+def test_bst_multiset():
+    bst = BST([1, 1, 1, 1], multiset=True)
+    assert bst.height() == 0  # One node, counted four times.
+    assert bst.size == 4
+    assert bst.root.count == 4
+    assert bst.in_order() == [1, 1, 1, 1]
+
+    bst.insert(2)
+    bst.insert(0)
+    assert list(bst.iter_reverse_order()) == [2, 1, 1, 1, 1, 0]
+    assert bst.select(3) == 1
+    assert bst.rank(2) == 5
+    assert list(bst.range(1, 1)) == [1, 1, 1, 1]
+
+    assert bst.delete(1) == 1
+    assert bst.root.count == 3
+    assert bst.size == 5
@@ -0,0 +1,106 @@
+import sys
+from array import array
+
+import pytest
+from click.testing import CliRunner
+
+from src.cli.commands import avl, maxheap
+
+KEYS = [5, 1, 9, 3, 7, 3]
+TEXT = "\n".join(map(str, KEYS)) + "\n"
+
+
+def run(command, args, input=TEXT):
+    return CliRunner().invoke(command, args, input=input)
+
+
+def lines(result):
+    assert result.exit_code == 0, result.output
+    return [int(line) for line in result.stdout.split()]
+
+
+@pytest.mark.parametrize('args', [
+    ['--top', '2', '--sort'],
+    ['--top', '2', '--pretty-print'],
+    ['--top', '2', '--outline'],
+    ['--top', '2', '--save', 'heap.bin'],
+    ['--top', '2', '--compact'],
+    ['--top', '2', '--arity', '3'],
+    ['--sort', '--depth', '2'],
+])
+def test_maxheap_usage_errors(tmp_path, args):
+    args = [str(tmp_path / arg) if arg.endswith('.bin') else arg for arg in args]
+    result = run(maxheap, args)
+    assert result.exit_code == 2 and "Error: Cannot use" in result.stderr
+    assert result.stdout == "" and not list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize('command', [maxheap, avl])
+def test_bad_input_is_a_usage_error(command):
+    result = run(command, [], input="1\n-\n2\n")
+    assert result.exit_code == 2 and "Only integers are allowed." in result.stderr
+
+
+def test_maxheap_compact_rejects_big_integers():
+    result = run(maxheap, ['--compact'], input="99999999999999999999\n")
+    assert result.exit_code == 2 and "--compact only holds 64 bit integers." in result.stderr
+
+
+def test_maxheap_top():
+    assert lines(run(maxheap, ['--top', '2'])) == [9, 7]
+    assert lines(run(maxheap, ['--top', '10'])) == sorted(KEYS, reverse=True)
+
+
+def test_maxheap_sort_and_text_beyond_64_bits():
+    assert lines(run(maxheap, ['--sort'])) == sorted(KEYS, reverse=True)
+    assert lines(run(maxheap, ['--sort'], input="99999999999999999999\n1\n")) == [99999999999999999999, 1]
+
+
+@pytest.mark.parametrize('arity', ['2', '4'])
+def test_maxheap_save_load(tmp_path, arity):
+    path = str(tmp_path / 'heap.bin')
+    saved = lines(run(maxheap, ['--save', path, '--arity', arity]))
+    assert lines(run(maxheap, ['--load', path], input="")) == saved
+    assert lines(run(maxheap, ['--load', path, '--sort'], input="")) == sorted(KEYS, reverse=True)
+    assert lines(run(maxheap, ['--load', path, '--top', '3'], input="")) == [9, 7, 5]
+
+
+def test_maxheap_save_rejects_big_integers(tmp_path):
+    result = run(maxheap, ['--save', str(tmp_path / 'heap.bin')], input="99999999999999999999\n")
+    assert result.exit_code == 2 and "Snapshots only hold 64 bit integers." in result.stderr
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize('multiset', [[], ['--multiset']])
+@pytest.mark.parametrize('engine', ['avl', 'red-black', 'blocks'])
+def test_avl_save_load(tmp_path, engine, multiset):
+    path = str(tmp_path / 'tree.bin')
+    expected = sorted(KEYS) if multiset else sorted(set(KEYS))
+    assert lines(run(avl, ['--engine', engine, '--save', path] + multiset)) == expected
+    assert lines(run(avl, ['--engine', engine, '--load', path], input="")) == expected
+
+
+@pytest.mark.parametrize('command, expected', [
+    (maxheap, sorted(KEYS, reverse=True)),
+    (avl, sorted(set(KEYS))),
+])
+def test_binary_input(command, expected):
+    data = array('q', KEYS)
+    if sys.byteorder == 'big':
+        data.byteswap()  # Binary input is little endian.
+    args = ['--input-format', 'binary'] + (['--sort'] if command is maxheap else [])
+    assert lines(run(command, args, input=data.tobytes())) == expected
+
+
+def test_avl_pretty_print():
+    assert run(avl, ['--outline'], input="2\n1\n3\n").stdout == "2\n|-- 1\n`-- 3\n"
+    assert run(avl, ['--outline', '--depth', '0'], input="2\n1\n3\n").stdout == "2 ...\n"
+    assert run(avl, ['--depth', '1'], input="2\n1\n3\n").stdout.split() == ["2", "/", "\\", "/", "\\", "1", "3"]
+
+
+@pytest.mark.parametrize('command', [maxheap, avl])
+def test_stats_go_to_stderr(command):
+    result = run(command, ['--stats'])
+    assert result.exit_code == 0
+    assert "comparisons" in result.stderr and "comparisons" not in result.stdout
+    assert lines(result) == lines(run(command, []))
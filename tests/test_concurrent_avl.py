@@ -0,0 +1,129 @@
+import random
+import threading
+
+from src.data_structures.concurrent_avl import ConcurrentAVL
+from src.data_structures.persistent_avl import PersistentAVL
+from tests.helpers import assert_avl
+
+
+def test_concurrent_avl_insert_delete():
+    rng = random.Random(24)
+    tree = ConcurrentAVL([])
+    keys = []
+    for _ in range(2000):
+        key = rng.randrange(500)
+        if rng.random() < 0.6 and key not in keys:
+            tree.insert(key)
+            keys.append(key)
+        else:
+            assert tree.delete(key) == (key if key in keys else None)
+            if key in keys:
+                keys.remove(key)
+    assert assert_avl(tree.snapshot()) == sorted(keys)
+    assert tree.in_order() == sorted(keys)
+    assert list(tree.iter_reverse_order()) == sorted(keys, reverse=True)
+    assert tree.size == len(keys)
+
+
+def test_concurrent_avl_navigation():
+    tree = ConcurrentAVL(range(0, 100, 2))
+    assert assert_avl(tree.snapshot()) == list(range(0, 100, 2))
+    assert tree.search(40) == 40 and 40 in tree
+    assert tree.search(41) is None
+    assert (tree.min(), tree.max()) == (0, 98)
+    assert (tree.floor(41), tree.floor(40), tree.floor(-1)) == (40, 40, None)
+    assert (tree.ceiling(41), tree.ceiling(40), tree.ceiling(99)) == (42, 40, None)
+    assert (tree.predecessor(40), tree.predecessor(0)) == (38, None)
+    assert (tree.successor(40), tree.successor(98)) == (42, None)
+    assert list(tree.range(7, 21)) == [8, 10, 12, 14, 16, 18, 20]
+    assert (tree.rank(40), tree.select(20), tree.select(50)) == (20, 40, None)
+    assert tree.count_range(7, 21) == 7
+    assert tree.percentile(50) == 48
+
+
+def test_concurrent_avl_multiset():
+    tree = ConcurrentAVL([5, 1, 5, 3, 5], multiset=True)
+    tree.insert(3)
+    assert assert_avl(tree.snapshot()) == [1, 3, 3, 5, 5, 5]
+    assert tree.size == 6 and tree.count_range(3, 5) == 5
+    assert tree.delete(5) == 5
+    assert tree.in_order() == [1, 3, 3, 5, 5]
+
+
+def test_concurrent_avl_write_shares_nodes():
+    tree = ConcurrentAVL(range(1023))
+    before = tree.snapshot()
+    tree.insert(2000)
+    # Only the right spine was copied: the whole left subtree is shared.
+    after = tree.snapshot()
+    assert after.root is not before.root and after.root.left is before.root.left
+    assert assert_avl(before) == list(range(1023))
+
+
+def test_concurrent_avl_readers_see_consistent_versions():
+    tree = ConcurrentAVL(range(0, 2000, 2))
+    done = threading.Event()
+    errors = []
+
+    def writer():
+        rng = random.Random(0)
+        for _ in range(3000):
+            key = rng.randrange(1, 2000, 2)  # Odd keys come and go, even keys always stay.
+            if tree.delete(key) is None:
+                tree.insert(key)
+        done.set()
+
+    def reader():
+        while not done.is_set():
+            keys = list(tree.range(0, 2000))
+            if keys != sorted(keys) or [key for key in keys if key % 2 == 0] != list(range(0, 2000, 2)):
+                errors.append(keys)
+            if tree.search(1000) != 1000:
+                errors.append(1000)
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert_avl(tree.snapshot())
+
+
+def test_concurrent_avl_two_read_queries_use_one_version():
+    tree = ConcurrentAVL(range(0, 2000, 2))
+    done = threading.Event()
+    errors = []
+
+    def writer():
+        for _ in range(3000):
+            # -1 comes and goes: it moves every rank (and the size) by one, but never the answers below.
+            tree.insert(-1)
+            tree.delete(-1)
+        done.set()
+
+    def reader():
+        while not done.is_set():
+            # Each call reads the tree twice (two ranks, or size then select): mixing versions is off by one.
+            if tree.count_range(0, 2000) != 1000:
+                errors.append('count_range')
+            if tree.percentile(100) != 1998:
+                errors.append('percentile')
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+
+
+def test_concurrent_avl_snapshot():
+    tree = ConcurrentAVL(range(100))
+    snapshot = tree.snapshot()
+    tree.insert(100)
+    tree.delete(0)
+    assert isinstance(snapshot, PersistentAVL) and not isinstance(snapshot, ConcurrentAVL)
+    assert snapshot.in_order() == list(range(100))
+    assert snapshot.insert(100).in_order() == list(range(101))
+    assert tree.in_order() == list(range(1, 101))
@@ -0,0 +1,43 @@
+from src.data_structures.indexed_maxheap import IndexedMaxHeap
+
+
+def is_valid(heap):
+    keys = heap._keys
+    heap_ok = all(keys[(i - 1) >> 1] >= keys[i] for i in range(1, len(keys)))
+    index_ok = all(heap._index[h] == i for i, h in enumerate(heap._handles))
+    return heap_ok and index_ok and len(heap._index) == len(keys)
+
+
+def test_insert_and_extract_max():
+    heap = IndexedMaxHeap([7, 8])
+    handle = heap.insert(9)
+    assert handle == 2
+    assert heap.max_handle() == handle
+    assert is_valid(heap)
+
+    assert heap.pop_item() == (2, 9)
+    assert heap.extract_max() == 8
+    assert heap.extract_max() == 7
+    assert heap.extract_max() == -1
+    assert heap.pop_item() is None
+
+
+def test_update():
+    heap = IndexedMaxHeap([5, 3, 8, 1])
+    heap.update(3, 10)  # Increase.
+    assert heap.max_handle() == 3
+    heap.update(3, 0)  # Decrease.
+    assert heap.max_handle() == 2
+    assert heap.get_key(3) == 0
+    assert is_valid(heap)
+
+
+def test_remove():
+    heap = IndexedMaxHeap([5, 3, 8, 1, 9, 2])
+    assert 1 in heap
+    assert heap.remove(1) == 3
+    assert 1 not in heap
+    assert heap.remove(4) == 9
+    assert heap.remove(5) == 2  # Last key.
+    assert is_valid(heap)
+    assert [heap.extract_max() for _ in range(heap.size())] == [8, 5, 1]
@@ -0,0 +1,67 @@
+import io
+import struct
+
+import pytest
+
+from src.util import ingest
+from src.util.ingest import parse_text, read_chunks, read_integers
+
+TEXT = b'10 200 -3000\n4\t5  66666\r\n7\n'
+INTEGERS = [10, 200, -3000, 4, 5, 66666, 7]
+
+
+@pytest.fixture(params=[True, False], ids=['numpy', 'python'])
+def parser(request, monkeypatch):
+    if request.param:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(ingest, 'numpy', None)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 8, 1 << 20])
+def test_read_text_chunks(parser, chunk_size):
+    assert list(read_integers(io.BytesIO(TEXT), chunk_size=chunk_size)) == INTEGERS
+    assert list(read_integers(io.BytesIO(b'42'), chunk_size=chunk_size)) == [42]
+
+
+def test_parse_text_errors(parser):
+    assert list(parse_text(b' \n ')) == []
+    for bad in (b'1 x 3', b'1.5', b'4\n-\n7', b'1 - 2', b'+', b'-', b'5 +', b'--1', b'1-2', b'1_000'):
+        with pytest.raises(ValueError):
+            parse_text(bad)
+    assert list(parse_text(b'9223372036854775807 -9223372036854775808')) == [2 ** 63 - 1, -2 ** 63]
+
+
+def test_parse_text_beyond_64_bits(parser):
+    integers = parse_text(b'1 99999999999999999999 -9223372036854775809')
+    assert integers == [1, 99999999999999999999, -2 ** 63 - 1]
+    assert read_integers(io.BytesIO(b'1 2 3 99999999999999999999'), chunk_size=4) == [1, 2, 3, 99999999999999999999]
+
+
+def test_parsers_accept_the_same_tokens(monkeypatch):
+    pytest.importorskip('numpy')
+    inputs = (b'+5 -3 007', b'-0 +0', b' 12 ', b'4\n-\n7', b'+', b'5-', b'-+1', b'1_000', b'0x10', b'1e3',
+              b'\xd9\xa1', b'1\x0b2\x0c3', b'nan', b'inf', b'12a', b'9223372036854775808')
+
+    def parse_all():
+        results = []
+        for data in inputs:
+            try:
+                results.append(list(parse_text(data)))
+            except ValueError:
+                results.append(ValueError)
+        return results
+
+    with_numpy = parse_all()
+    monkeypatch.setattr(ingest, 'numpy', None)
+    assert parse_all() == with_numpy
+
+
+def test_read_binary_chunks():
+    data = struct.pack('<7q', *INTEGERS)
+    chunks = list(read_chunks(io.BytesIO(data), 'binary', chunk_size=20))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 2, 1]
+    assert list(read_integers(io.BytesIO(data), 'binary')) == INTEGERS
+
+    with pytest.raises(ValueError):
+        read_integers(io.BytesIO(data[:-1]), 'binary')
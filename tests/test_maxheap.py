@@ -1,4 +1,13 @@
-from src.data_structures.maxheap import MaxHeap
+from array import array
+
+import pytest
+
+from src.data_structures.maxheap import MaxHeap, compact_array, top_k
+
+
+def is_max_heap(heap):
+    keys = heap._heap
+    return all(keys[MaxHeap.parent(i)] >= keys[i] for i in range(1, len(keys)))
 
 
 def test_insert():
@@ -25,3 +34,145 @@ def test_extract_max():
     assert max_key == -1
 
 
+def test_sorted_array():
+    integers = [5, 1, 9, 3, 7, 3, 0]
+    heap = MaxHeap(list(integers))
+
+    assert heap.sorted_array() == sorted(integers, reverse=True)
+    assert heap.size() == 0
+
+
+def test_heapsort_in_place():
+    integers = [5, 1, 9, 3, 7, 3, 0]
+    heap = MaxHeap(integers)
+
+    sorted_list = heap.heapsort()
+    assert sorted_list is integers  # Backing array is not reallocated.
+    assert sorted_list == [9, 7, 5, 3, 3, 1, 0]
+    assert heap.extract_max() == 9  # Still a valid max heap.
+    assert heap.extract_max() == 7
+
+
+def test_build_insert_increase_key():
+    heap = MaxHeap([3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5])
+    assert is_max_heap(heap)
+
+    for key in [8, 0, 9, 7]:
+        heap.insert(key)
+        assert is_max_heap(heap)
+
+    heap.increase_key(heap.size() - 1, 10)
+    assert is_max_heap(heap)
+    assert heap.max() == 10
+
+
+def test_parent():
+    assert MaxHeap.parent(1) == 0
+    assert MaxHeap.parent(2) == 0
+    assert MaxHeap.parent(5) == 2
+    assert MaxHeap.parent(6) == 2
+
+
+def test_push_many():
+    heap = MaxHeap(list(range(100)))
+    heap.push_many([150, 3])  # Few keys, sifted up one at a time.
+    assert is_max_heap(heap)
+
+    heap.push_many(range(200, 400))  # Many keys, heap is rebuilt.
+    assert is_max_heap(heap)
+    assert heap.size() == 302
+    assert heap.max() == 399
+
+
+def test_pushpop_and_replace():
+    heap = MaxHeap([4, 8, 6])
+    assert heap.pushpop(10) == 10  # Larger than max, heap untouched.
+    assert heap.pushpop(5) == 8
+    assert heap.sorted_array() == [6, 5, 4]
+
+    heap = MaxHeap([])
+    assert heap.replace(3) == -1
+    assert heap.replace(1) == 3
+    assert heap.replace(2) == 1
+    assert heap.max() == 2
+
+
+def test_merge():
+    heap = MaxHeap([1, 5, 3])
+    other = MaxHeap([4, 2, 6])
+    heap.merge(other)
+    assert is_max_heap(heap)
+    assert heap.sorted_array() == [6, 5, 4, 3, 2, 1]
+    assert other.size() == 3
+
+
+def test_top_k():
+    integers = [5, 1, 9, 3, 7, 3, 0, 9]
+    assert top_k(integers, 3) == [9, 9, 7]
+    assert top_k(iter(integers), 1) == [9]
+    assert top_k(integers, 100) == sorted(integers, reverse=True)
+    assert top_k(integers, 0) == []
+    assert top_k([], 5) == []
+
+
+def test_compact():
+    heap = MaxHeap([3, 1, 4, 1, 5], compact=True)
+    assert heap.is_compact()
+    assert is_max_heap(heap)
+
+    heap.insert(9)
+    heap.push_many([2, 6])
+    assert heap.extract_max() == 9
+    assert list(heap.sorted_array()) == [6, 5, 4, 3, 2, 1, 1]
+    assert heap.is_compact()
+    assert heap.size() == 0
+
+
+def test_compact_array():
+    packed = array('q', [1, 2, 3])
+    assert compact_array(packed) is packed  # No copy.
+
+    copied = compact_array(memoryview(packed))
+    assert copied is not packed
+    assert copied == packed
+
+    assert compact_array([1, 2, 3]) == packed
+    assert compact_array(array('i', [1, 2, 3])) == packed
+
+    assert MaxHeap(packed)._heap is packed
+
+
+def test_numpy_vectorized():
+    numpy = pytest.importorskip('numpy')
+    integers = [(i * 7919) % 5003 for i in range(5000)]
+
+    heap = MaxHeap(numpy.array(integers, dtype=numpy.int64))
+    assert heap.is_compact()
+    assert list(heap._heap) == MaxHeap(list(integers))._heap  # Same heap as the pure Python build.
+
+    heap.insert(6000)
+    assert heap.extract_max() == 6000
+    assert list(heap.sorted_array()) == sorted(integers, reverse=True)
+
+
+def test_dary():
+    integers = [(i * 37) % 101 for i in range(100)]
+    for arity in [3, 4, 8]:
+        heap = MaxHeap(list(integers), arity=arity)
+        keys = heap._heap
+        assert all(keys[heap.parent_of(i)] >= keys[i] for i in range(1, heap.size()))
+
+        heap.insert(1000)
+        assert heap.max() == 1000
+        assert heap.violation(0) == 0
+        assert heap.extract_max() == 1000
+        assert heap.sorted_array() == sorted(integers, reverse=True)
+
+
+def test_dary_height():
+    assert MaxHeap([], arity=4).height() == -1
+    assert MaxHeap([1], arity=4).height() == 0
+    assert MaxHeap(list(range(5)), arity=4).height() == 1
+    assert MaxHeap(list(range(6)), arity=4).height() == 2
+    assert MaxHeap(list(range(7)), arity=2).height() == 2
+    assert MaxHeap(list(range(8)), arity=2).height() == 3
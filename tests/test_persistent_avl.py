@@ -0,0 +1,61 @@
+import random
+
+from src.data_structures.persistent_avl import PersistentAVL
+from src.util.stats import Stats
+from tests.helpers import assert_avl
+
+
+def test_persistent_avl_old_versions_survive():
+    rng = random.Random(25)
+    versions = [(PersistentAVL([]), [])]
+    for _ in range(1000):
+        tree, keys = versions[-1]
+        key = rng.randrange(200)
+        if rng.random() < 0.6 and key not in keys:
+            versions.append((tree.insert(key), sorted(keys + [key])))
+        else:
+            new = tree.delete(key)
+            if key in keys:
+                versions.append((new, [k for k in keys if k != key]))
+            else:
+                assert new is tree
+    for tree, keys in versions:
+        assert assert_avl(tree) == keys
+        assert tree.size == len(keys)
+
+
+def test_persistent_avl_shares_untouched_nodes():
+    tree = PersistentAVL(range(1023))
+    new = tree.insert(2000).delete(1022)
+    assert new.in_order() == list(range(1022)) + [2000]
+    assert tree.in_order() == list(range(1023))
+    assert new.root.left is tree.root.left
+
+
+def test_persistent_avl_update_allocates_lg_n_nodes():
+    stats = Stats()
+    tree = stats.instrument(PersistentAVL)(range(1 << 12))
+    assert stats.counters['allocations'] == 1 << 12
+    for key in range(1 << 12, (1 << 12) + 100):
+        stats.counters.clear()
+        tree = tree.insert(key)  # Sorted inserts: rotations all the way.
+        assert stats.counters['allocations'] <= 2 * (tree.height() + 1)
+    stats.counters.clear()
+    tree = tree.delete(2048)
+    assert 0 < stats.counters['allocations'] <= 2 * (tree.height() + 1)
+    assert type(tree).__name__ == 'PersistentAVL'  # Versions stay instrumented.
+
+
+def test_persistent_avl_multiset():
+    tree = PersistentAVL([5, 1, 5], multiset=True)
+    new = tree.insert(5).insert(3)
+    assert assert_avl(new) == [1, 3, 5, 5, 5]
+    assert tree.in_order() == [1, 5, 5]
+    assert new.delete(5).count_range(5, 5) == 2
+
+
+def test_persistent_avl_duplicates_on_either_side():
+    for tree in (PersistentAVL([1, 1, 1]), PersistentAVL([]).insert(1).insert(1).insert(1)):
+        assert tree.root.right.data == 1  # An equal key in a right subtree.
+        assert (tree.search(1), tree.rank(1), tree.count_range(1, 1)) == (1, 0, 3)
+        assert list(tree.range(1, 1)) == [1, 1, 1] and tree.delete(1).delete(1).in_order() == [1]
@@ -0,0 +1,67 @@
+from src.data_structures.avl import AVL
+from src.data_structures.maxheap import MaxHeap
+from src.util.pretty_print import dary_max_depth, render_dary_tree, render_outline, render_tree
+
+
+def children(node):
+    return node.left, node.right
+
+
+def label(node):
+    return str(node.data)
+
+
+def test_render_tree_skips_empty_subtrees():
+    avl = AVL([2, 1])
+    assert render_tree(avl.root, children, label) == [
+        "     2",
+        "    / \\",
+        "   /   \\",
+        "  1     x",
+    ]
+
+
+def test_render_tree_max_depth():
+    avl = AVL(range(1 << 16))
+    lines = render_tree(avl.root, children, label, max_depth=2)
+    assert lines[-1] == "(levels below 2 not shown)"
+    assert len(lines) < 20
+
+
+def test_render_outline():
+    avl = AVL([1, 2, 3, 4])
+    assert render_outline(avl.root, children, label) == [
+        "3",
+        "|-- 2",
+        "|   |-- 1",
+        "|   `-- x",
+        "`-- 4",
+    ]
+    assert render_outline(avl.root, children, label, max_depth=0) == ["3 ..."]
+
+
+def test_maxheap_pretty_print(capsys):
+    MaxHeap([1, 2, 3, 4]).pretty_print(outline=True)
+    assert capsys.readouterr().out == "4\n|-- 2\n|   `-- 1\n`-- 3\n"
+
+
+def test_render_dary_tree():
+    assert render_dary_tree([[9], [7, 8, 5], [1, 2, 3]], 3) == [
+        "        9",
+        "  /     |     \\",
+        "  7     8     5",
+        "/ | \\",
+        "1 2 3",
+    ]
+
+
+def test_dary_max_depth():
+    assert [dary_max_depth(arity) for arity in (2, 3, 4, 8, 200)] == [7, 4, 3, 2, 1]
+
+
+def test_maxheap_dary_pretty_print_width(capsys):
+    for arity in (2, 3, 4, 8, 16):
+        MaxHeap(list(range(300000)), arity=arity).pretty_print()
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[-1].startswith("(levels below")
+        assert max(map(len, lines)) < 1500  # 7 levels of a binary heap are 1,405 columns.
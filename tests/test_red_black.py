@@ -0,0 +1,60 @@
+import random
+from collections import Counter
+
+from src.data_structures.red_black import RedBlack, is_red
+
+
+def assert_red_black(tree):
+    """Check parent pointers, heights, sizes and the red-black rep invariant. Return the black height."""
+    def check(node):
+        if node is None:
+            return 0
+        for child in (node.left, node.right):
+            if child:
+                assert child.parent is node
+        if node.red:
+            assert not is_red(node.left) and not is_red(node.right)
+        black_height = check(node.left)
+        assert check(node.right) == black_height
+        assert node.size == tree.node_size(node.left) + tree.node_size(node.right) + node.count
+        assert node.height == max(tree.node_height(node.left), tree.node_height(node.right)) + 1
+        return black_height + (0 if node.red else 1)
+
+    if tree.root:
+        assert not tree.root.red and tree.root.parent is None
+    return check(tree.root)
+
+
+def test_red_black_sorted_insert_is_balanced():
+    tree = RedBlack([])
+    for i in range(1000):
+        tree.insert(i)
+    assert_red_black(tree)
+    assert 9 <= tree.height() <= 2 * 10  # 2 lg(n + 1)
+    assert tree.in_order() == list(range(1000))
+
+
+def test_red_black_bulk_load():
+    for n in range(40):
+        tree = RedBlack(range(n))
+        assert_red_black(tree)
+        assert tree.in_order() == list(range(n))
+
+
+def test_red_black_random_insert_delete():
+    rng = random.Random(18)
+    for multiset in (False, True):
+        tree = RedBlack([], multiset=multiset)
+        counts = Counter()
+        for _ in range(3000):
+            key = rng.randrange(200)
+            if rng.random() < 0.55:
+                tree.insert(key)
+                counts[key] += 1
+            else:
+                assert tree.delete(key) == (key if counts[key] else None)
+                counts[key] -= 1 if counts[key] else 0
+        assert_red_black(tree)
+        assert tree.in_order() == sorted(counts.elements())
+        assert tree.size == sum(counts.values())
+        assert tree.select(0) == tree.min()
@@ -0,0 +1,102 @@
+import tracemalloc
+
+import pytest
+
+from src.data_structures.avl import AVL
+from src.data_structures.block_list import BlockList
+from src.data_structures.maxheap import MaxHeap
+from src.data_structures.red_black import RedBlack
+
+
+def test_maxheap_save_load(tmp_path):
+    path = str(tmp_path / 'heap.bin')
+    heap = MaxHeap([5, 3, 8, 1, 9, 2], arity=3)
+    heap.save(path)
+
+    loaded = MaxHeap.load(path)
+    assert list(loaded._heap) == list(heap._heap)
+    assert (loaded.arity, loaded.max(), loaded.height()) == (3, 9, heap.height())
+
+    writable = MaxHeap.load(path, writable=True)
+    writable.insert(10)
+    assert list(writable.sorted_array()) == [10, 9, 8, 5, 3, 2, 1]
+
+    MaxHeap([]).save(path)
+    assert MaxHeap.load(path).max() == -1
+
+
+def test_maxheap_load_writable_copies_once(tmp_path):
+    path = str(tmp_path / 'heap.bin')
+    MaxHeap(range(1 << 20), compact=True).save(path)
+    tracemalloc.start()
+    heap = MaxHeap.load(path, writable=True)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert heap.size() == 1 << 20
+    assert peak < 1.25 * 8 * (1 << 20)  # One 8 MB array, no second copy.
+
+
+@pytest.mark.parametrize('multiset', [False, True])
+def test_tree_save_load(tmp_path, multiset):
+    path = str(tmp_path / 'tree.bin')
+    keys = [5, 1, 5, 3, 9, 5, 7, 3]
+    tree = AVL(keys, multiset=multiset)
+    tree.save(path)
+
+    snapshot = AVL.load(path)
+    assert snapshot.size == len(keys)
+    assert snapshot.in_order() == list(snapshot) == sorted(keys)
+    assert list(snapshot.iter_reverse_order()) == sorted(keys, reverse=True)
+    assert (snapshot.search(5), snapshot.search(4)) == (5, None)
+    assert (snapshot.min(), snapshot.max()) == (1, 9)
+    assert (snapshot.floor(4), snapshot.ceiling(4)) == (3, 5)
+    assert (snapshot.predecessor(5), snapshot.successor(5)) == (3, 7)
+    assert list(snapshot.range(3, 5)) == [3, 3, 5, 5, 5]
+    for k in range(len(keys)):
+        assert snapshot.select(k) == tree.select(k)
+    assert (snapshot.rank(5), snapshot.count_range(3, 5)) == (tree.rank(5), 5)
+    assert snapshot.percentile(50) == tree.percentile(50)
+
+    thawed = snapshot.thaw()
+    assert isinstance(thawed, AVL) and thawed.multiset == multiset
+    assert thawed.in_order() == sorted(keys)
+    assert thawed.height() == snapshot.height()
+
+
+@pytest.mark.parametrize('tree_class', [AVL, RedBlack])
+@pytest.mark.parametrize('multiset', [False, True])
+def test_tree_snapshot_pretty_print_without_thawing(tmp_path, capsys, monkeypatch, tree_class, multiset):
+    path = str(tmp_path / 'tree.bin')
+    for keys in ([], [4], [5, 1, 5, 3, 9, 5, 7, 3], list(range(300)) * 2):
+        tree = tree_class(keys, multiset=multiset)
+        tree.save(path)
+        snapshot = tree_class.load(path)
+        thawed = snapshot.thaw()
+        for args in ((), (2,), (None, True), (1, True)):
+            thawed.pretty_print(*args)
+            expected = capsys.readouterr().out
+            with monkeypatch.context() as patch:
+                patch.setattr(snapshot, 'thaw', None)  # Drawing must not build the tree.
+                snapshot.pretty_print(*args)
+            assert capsys.readouterr().out == expected
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = str(tmp_path / 'heap.bin')
+    MaxHeap([1, 2]).save(path)
+    with pytest.raises(ValueError):
+        BlockList.load(path)
+
+
+def test_load_rejects_truncated_files(tmp_path):
+    heap_path, tree_path = str(tmp_path / 'heap.bin'), str(tmp_path / 'tree.bin')
+    MaxHeap([1, 2, 3]).save(heap_path)
+    AVL([1, 1, 2], multiset=True).save(tree_path)
+    for path, load in ((heap_path, MaxHeap.load), (tree_path, AVL.load)):
+        with open(path, 'rb') as file:
+            data = file.read()
+        for size in (len(data) - 8, len(data) - 3, len(data) + 5):
+            with open(path, 'wb') as file:
+                file.write(data[:size].ljust(size, b'\0'))
+            with pytest.raises(ValueError):
+                load(path)
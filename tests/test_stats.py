@@ -0,0 +1,51 @@
+from src.data_structures.avl import AVL
+from src.data_structures.bst import BST
+from src.data_structures.maxheap import MaxHeap, top_k
+from src.util.stats import Stats
+
+
+def test_instrument_avl():
+    stats = Stats()
+    Key = stats.key_type()
+    avl = stats.instrument(AVL)([])
+    for i in range(1, 8):
+        avl.insert(Key(i))
+
+    assert isinstance(avl, AVL)
+    assert avl.in_order() == list(range(1, 8))
+    assert stats.counters['allocations'] == 7
+    assert stats.counters['rotations.left'] == 4  # Sorted input only ever leans right.
+    assert stats.counters['comparisons'] > 0
+    assert stats.histograms['time.insert'].count == 7
+    assert 'rotations.left' in stats.report()
+
+    assert stats.counters['rebalances'] == 4  # Only the calls that rotated.
+    assert 'swaps' not in stats.report()
+
+    # The real classes are left alone.
+    assert AVL.left_rotate is BST.left_rotate and AVL.node_class is BST.node_class
+
+
+def test_instrument_maxheap():
+    stats = Stats()
+    heap = stats.instrument(MaxHeap)(list(map(stats.key_type(), [1, 2, 3, 4, 5, 6, 7])))
+    assert stats.histograms['sift_down.levels'].count == 3
+    assert stats.histograms['sift_down.levels'].max == 2
+    assert heap.extract_max() == 7
+
+    stats = Stats()
+    assert top_k(range(100), 3, stats.instrument(MaxHeap)) == [99, 98, 97]
+    assert stats.histograms['time.pushpop'].count == 97
+
+
+def test_instrument_avl_double_rotations():
+    stats = Stats()
+    for keys, counter in (((3, 1, 2), 'rotations.zigzag'), ((1, 3, 2), 'rotations.zagzig')):
+        avl = stats.instrument(AVL)([])
+        for i in keys:  # 2 goes left then right (or right then left).
+            avl.insert(i)
+        assert avl.in_order() == [1, 2, 3]
+        assert stats.counters[counter] == 1
+    # Counted as double rotations only, not also as the two single rotations they are made of.
+    assert 'rotations.left' not in stats.counters and 'rotations.right' not in stats.counters
+    assert stats.counters['rebalances'] == 2